@@ -0,0 +1,627 @@
+"""End-to-end frame pipeline benchmark: python benchmark.py --frames 300 --output bench_results.json"""
+
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import mediapipe as mp
+from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+from handgesture import (
+    GAME_CLASSES,
+    PRESS_DETECTORS,
+    CallbackSink,
+    GeneratorSource,
+    ImageSequenceSource,
+    LandmarkRecorder,
+    VideoFileSource,
+    VirtualKeyboard,
+    WordPredictor,
+)
+
+GAMES = ["pong", "brick", "catch", "snake", "mole", "balloon", "flappy", "dodge", "shooter"]
+
+
+class ScriptedGraph:
+    """Stands in for a MediaPipe graph and returns scripted results per frame."""
+
+    def __init__(self, script, roi=None):
+        self.script = script
+        self.roi = roi
+        self.calls = 0
+
+    def process(self, image):
+        result = self.script(self.calls)
+        self.calls += 1
+        if self.roi is not None:
+            rx, ry, rw, rh = self.roi.roi
+            lists = list(getattr(result, "multi_face_landmarks", None) or [])
+            if getattr(result, "pose_landmarks", None) is not None:
+                lists.append(result.pose_landmarks)
+            for lst in lists:
+                for lm in lst.landmark:
+                    lm.x = (lm.x - rx) / rw
+                    lm.y = (lm.y - ry) / rh
+        return result
+
+    def close(self):
+        pass
+
+
+def hand_points(x, y, shape="open"):
+    pts = {0: (x + 40, y + 230), 1: (x - 30, y + 200), 2: (x - 60, y + 170), 3: (x - 90, y + 140), 4: (x - 120, y + 110)}
+    raised = {"open": (True, True, True, True), "pinch": (True, False, False, False),
+              "point": (True, False, False, False), "thumbs_up": (False, False, False, False)}[shape]
+    for finger, dx in enumerate((0, 35, 70, 100)):
+        base = 5 + finger * 4
+        lift = 20 if finger == 3 else 0
+        if raised[finger]:
+            joints = (y + 120, y + 80, y + 40, y)
+        else:
+            joints = (y + 120, y + 80, y + 110, y + 140)
+        for joint, jy in enumerate(joints):
+            pts[base + joint] = (x + dx, jy + lift)
+    if shape == "pinch":
+        pts[4] = (x + 12, y + 18)
+    elif shape == "point":
+        pts[4] = (x - 40, y + 150)
+    elif shape == "thumbs_up":
+        pts[4] = (x - 40, y - 60)
+    return pts
+
+
+def landmark_list(points, count, w, h, visibility=None):
+    lst = landmark_pb2.NormalizedLandmarkList()
+    for idx in range(count):
+        px, py = points.get(idx, (w / 2, h / 2))
+        lm = lst.landmark.add(x=px / w, y=py / h, z=0.0)
+        if visibility is not None:
+            lm.visibility = visibility
+    return lst
+
+
+def hands_result(w, h, hands):
+    if not hands:
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+    landmarks = []
+    handedness = []
+    for x, y, shape, label in hands:
+        landmarks.append(landmark_list(hand_points(x, y, shape), 21, w, h))
+        classes = classification_pb2.ClassificationList()
+        classes.classification.add(index=0, score=1.0, label=label)
+        handedness.append(classes)
+    return SimpleNamespace(multi_hand_landmarks=landmarks, multi_handedness=handedness)
+
+
+def pose_result(w, h, angle):
+    elbow = (w * 0.5, h * 0.5)
+    arm = 160
+    upper = math.radians(-100)
+    lower = upper + math.radians(angle)
+    shoulder = (elbow[0] + arm * math.cos(upper), elbow[1] + arm * math.sin(upper))
+    wrist = (elbow[0] + arm * math.cos(lower), elbow[1] + arm * math.sin(lower))
+    pose = mp.solutions.pose.PoseLandmark
+    points = {}
+    for side, shift in (("LEFT", -20), ("RIGHT", 20)):
+        points[getattr(pose, f"{side}_SHOULDER")] = (shoulder[0] + shift, shoulder[1])
+        points[getattr(pose, f"{side}_ELBOW")] = (elbow[0] + shift, elbow[1])
+        points[getattr(pose, f"{side}_WRIST")] = (wrist[0] + shift, wrist[1])
+    return SimpleNamespace(pose_landmarks=landmark_list(points, 33, w, h, visibility=1.0))
+
+
+def key_center(kb, label):
+    entry = kb.get_key_geometry().lookup.get(label)
+    if entry is None:
+        return None
+    _, x, y = entry
+    return x + kb.key_width // 2, y + kb.key_height // 2
+
+
+def sweep(i, area):
+    x1, y1, x2, y2 = area
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    return int(cx + 0.45 * (x2 - x1) * math.sin(i * 0.07)), int(cy + 0.4 * (y2 - y1) * math.sin(i * 0.05))
+
+
+def idle_scenario(kb, w, h, args):
+    return lambda i: hands_result(w, h, []), None, None
+
+
+def keyboard_scenario(kb, w, h, args):
+    text = [c if c != " " else "Space" for c in "HELLO WORLD"]
+
+    def script(i):
+        key = text[(i // args.frames_per_key) % len(text)]
+        x, y = key_center(kb, key)
+        return hands_result(w, h, [(x, y, "open", "Right")])
+    return script, None, None
+
+
+def game_scenario(name):
+    def setup(kb, w, h, args):
+        kb.toggle_game_mode()
+        kb.current_game = name
+        kb.games[name].reset()
+        area = kb.games[name].game_area
+
+        def script(i):
+            x, y = sweep(i, area)
+            shape = "pinch" if name == "flappy" and (i // 8) % 2 else "open"
+            return hands_result(w, h, [(x, y, shape, "Right")])
+        return script, None, None
+    return setup
+
+
+def draw_scenario(kb, w, h, args):
+    kb.toggle_draw_mode()
+
+    def script(i):
+        x = int(w / 2 + 300 * math.cos(i * 0.05))
+        y = int(h / 2 + 250 * math.sin(i * 0.05))
+        return hands_result(w, h, [(x, y, "point", "Right")])
+    return script, None, None
+
+
+def meme_scenario(kb, w, h, args):
+    kb.toggle_meme_mode()
+    nose = (int(w * 0.3), int(h * 0.35))
+    shapes = ["thumbs_up", "point", "thinking", "open"]
+
+    def shape_at(i):
+        return shapes[(i // 60) % len(shapes)]
+
+    def hands(i):
+        shape = shape_at(i)
+        if shape == "thinking":
+            return hands_result(w, h, [(nose[0], nose[1], "point", "Right")])
+        return hands_result(w, h, [(int(w * 0.3), int(h * 0.5), shape, "Right")])
+
+    def face(i):
+        return SimpleNamespace(multi_face_landmarks=[landmark_list({4: nose}, 468, w, h)])
+    return hands, face, None
+
+
+def pushup_scenario(kb, w, h, args):
+    kb.toggle_pushup_mode()
+
+    def pose(i):
+        return pose_result(w, h, 122 + 55 * math.sin(i * 0.1))
+    return lambda i: hands_result(w, h, []), None, pose
+
+
+def photo_scenario(kb, w, h, args):
+    kb.toggle_photo_mode()
+    kb.photo_save_dir = tempfile.mkdtemp(prefix="bench_photos_")
+    kb.photo_countdown_seconds = 0.5
+    kb.photo_cooldown = 1.0
+
+    def script(i):
+        shape = "pinch" if (i // 30) % 2 else "open"
+        return hands_result(w, h, [(int(w * 0.5), int(h * 0.5), shape, "Right")])
+    return script, None, None
+
+
+SCENARIOS = collections.OrderedDict([("idle", idle_scenario), ("keyboard", keyboard_scenario)])
+for _game in GAMES:
+    SCENARIOS[f"game-{_game}"] = game_scenario(_game)
+SCENARIOS["draw"] = draw_scenario
+SCENARIOS["meme"] = meme_scenario
+SCENARIOS["pushup"] = pushup_scenario
+SCENARIOS["photo"] = photo_scenario
+
+
+def summarize(samples):
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    arr = np.asarray(samples, dtype=np.float64)
+    return {
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "max": round(float(arr.max()), 3)
+    }
+
+
+def build_source(args, frames):
+    if args.video:
+        if os.path.isdir(args.video):
+            return ImageSequenceSource(args.video)
+        return VideoFileSource(args.video)
+    rng = np.random.default_rng(args.seed)
+    background = rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    background = cv2.GaussianBlur(background, (0, 0), 9)
+    return GeneratorSource(itertools.repeat(background, frames))
+
+
+def run_scenario(name, args, recorder=None):
+    frames = args.frames + args.warmup
+    source = build_source(args, frames)
+    frame_ms = []
+    stages = collections.defaultdict(list)
+    seen = {}
+    state = {"last": None, "count": 0}
+
+    def on_frame(frame):
+        now = time.perf_counter()
+        state["count"] += 1
+        if state["last"] is not None and state["count"] > args.warmup:
+            frame_ms.append((now - state["last"]) * 1000.0)
+            for stage, hist in kb.profiler.histograms.items():
+                if stage != "frame" and hist.total != seen.get(stage):
+                    stages[stage].append(hist.last())
+                    seen[stage] = hist.total
+        state["last"] = now
+        if state["count"] >= frames:
+            return ord("q")
+        return None
+
+    kb = VirtualKeyboard(source=source, sink=CallbackSink(on_frame), target_fps=None)
+    kb.profiler.enabled = True
+    kb.landmark_recorder = recorder
+    w = int(source.get(cv2.CAP_PROP_FRAME_WIDTH)) or args.width
+    h = int(source.get(cv2.CAP_PROP_FRAME_HEIGHT)) or args.height
+    hands, face, pose = SCENARIOS[name](kb, w, h, args)
+    if not args.video:
+        kb.hands.close()
+        kb.face_mesh.close()
+        kb.pose.close()
+        kb.hands = ScriptedGraph(hands)
+        kb.face_mesh = ScriptedGraph(face or (lambda i: SimpleNamespace(multi_face_landmarks=None)), kb.face_roi)
+        kb.pose = ScriptedGraph(pose or (lambda i: SimpleNamespace(pose_landmarks=None)), kb.pose_roi)
+    start = time.perf_counter()
+    asyncio.run(kb.run())
+    wall = time.perf_counter() - start
+    total_ms = sum(frame_ms)
+    return {
+        "frames": len(frame_ms),
+        "wall_seconds": round(wall, 3),
+        "fps": round(len(frame_ms) / (total_ms / 1000.0), 2) if total_ms else 0.0,
+        "frame_ms": summarize(frame_ms),
+        "stages": {stage: summarize(values) for stage, values in sorted(stages.items())},
+        "capture": kb.capture.stats(),
+        "counters": dict(kb.profiler.counters),
+        "missed_deadlines": kb.pacer.missed_deadlines
+    }
+
+
+def detector_slug(detector):
+    return detector.name.lower().replace(" ", "-")
+
+
+def edit_distance(a, b):
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[len(b)]
+
+
+def offline_keyboard(width, height):
+    source = GeneratorSource(itertools.repeat(np.zeros((height, width, 3), dtype=np.uint8), 1))
+    return VirtualKeyboard(source=source, sink=CallbackSink(lambda frame: None), target_fps=None)
+
+
+def close_keyboard(kb):
+    kb.capture.release()
+    kb.inference.shutdown()
+    kb.hands.close()
+    kb.face_mesh.close()
+    kb.pose.close()
+
+
+def load_session(path):
+    with open(path) as fh:
+        header = json.loads(fh.readline())
+        frames = [json.loads(line) for line in fh if line.strip()]
+    return header, frames
+
+
+def synthetic_session(phrase, hold, travel=0.25, fps=30, width=1280, height=720):
+    """Scripted typist that rests on each key, air taps after 0.1 s and pinches after 0.2 s."""
+    kb = offline_keyboard(width, height)
+    targets = [key_center(kb, "Space" if ch == " " else ch) for ch in phrase]
+    close_keyboard(kb)
+    frames = []
+    t = 0.0
+    step = 1.0 / fps
+    prev = (targets[0][0] - 150, targets[0][1] + 60)
+    for target in targets:
+        start = t
+        while t < start + travel + hold:
+            elapsed = t - start
+            if elapsed < travel:
+                k = elapsed / travel
+                k = k * k * (3 - 2 * k)
+                x, y = prev[0] + (target[0] - prev[0]) * k, prev[1] + (target[1] - prev[1]) * k
+            else:
+                x, y = target
+            points = hand_points(x, y, "open")
+            scale = math.hypot((points[9][0] - points[0][0]) / width, (points[9][1] - points[0][1]) / height)
+            resting = elapsed - travel
+            tap = max(0.0, 1.0 - abs(resting - 0.2) / 0.1) if resting >= 0 else 0.0
+            if 0.2 <= resting < 0.32:
+                points[4] = (x + 12, y + 18)
+            landmarks = [[points[idx][0] / width, points[idx][1] / height, 0.0] for idx in range(21)]
+            landmarks[8][2] = -0.4 * scale * tap
+            frames.append({"t": round(t, 4), "hands": [{"label": "right", "landmarks": landmarks}]})
+            t += step
+        prev = target
+    return {"version": 1, "width": width, "height": height, "target": phrase}, frames
+
+
+def replay_typing(header, frames, detector):
+    width, height = header["width"], header["height"]
+    kb = offline_keyboard(width, height)
+    kb.press_detector = detector()
+    overlay = np.zeros((height, width, 3), dtype=np.uint8)
+    hover = {}
+    delays = []
+    for frame in frames:
+        t = frame["t"]
+        kb.hovered_keys = {}
+        kb.hovered_suggestions = set()
+        kb.finger_filter.begin_frame()
+        for hand in frame["hands"]:
+            lst = landmark_pb2.NormalizedLandmarkList()
+            for x, y, z in hand["landmarks"]:
+                lst.landmark.add(x=x, y=y, z=z)
+            label = hand["label"]
+            thumb = (int(lst.landmark[4].x * width), int(lst.landmark[4].y * height))
+            pinky = (int(lst.landmark[20].x * width), int(lst.landmark[20].y * height))
+            hand_center = ((thumb[0] + pinky[0]) // 2, (thumb[1] + pinky[1]) // 2)
+            tip = lst.landmark[8]
+            finger_pos = kb.finger_filter.update(label, (tip.x * width, tip.y * height), t, (width, height))
+            if not kb.keyboard_visible(lst, thumb, pinky):
+                hover.pop(label, None)
+                continue
+            typed = len(kb.typed_text)
+            kb.process_finger_input(overlay, finger_pos[0], finger_pos[1], label, hand_center, lst, now=t)
+            hit = kb.hovered_keys.get(label)
+            key = hit[0] if hit else None
+            if key is None or hover.get(label, (None,))[0] != key:
+                hover[label] = (key, t)
+            if len(kb.typed_text) != typed:
+                delays.append((t - hover[label][1]) * 1000.0)
+    duration = frames[-1]["t"] - frames[0]["t"] if len(frames) > 1 else 0.0
+    target = header.get("target", "")
+    typed = kb.typed_text
+    close_keyboard(kb)
+    return {
+        "typed": typed,
+        "characters": len(typed),
+        "cpm": round(len(typed) / duration * 60.0, 1) if duration else 0.0,
+        "error_rate": round(edit_distance(typed, target) / len(target), 3) if target else None,
+        "press_delay_ms": summarize(delays),
+        "session_seconds": round(duration, 2)
+    }
+
+
+def run_typing(args):
+    detectors = [d for d in PRESS_DETECTORS if not args.detector or detector_slug(d) in args.detector]
+    report = {}
+    print(f"{'session':<24}{'detector':<12}{'cpm':>8}{'errors':>9}{'delay ms':>10}")
+    for session in args.typing:
+        if session == "synthetic":
+            header, frames = synthetic_session(args.phrase, args.hold)
+        else:
+            header, frames = load_session(session)
+        results = report.setdefault(session, {})
+        for detector in detectors:
+            result = replay_typing(header, frames, detector)
+            results[detector_slug(detector)] = result
+            errors = f"{result['error_rate']:.1%}" if result["error_rate"] is not None else "-"
+            print(f"{os.path.basename(session):<24}{detector_slug(detector):<12}{result['cpm']:>8.1f}{errors:>9}"
+                  f"{result['press_delay_ms']['mean']:>10.0f}")
+    return report
+
+
+def run_games(args):
+    report = {}
+    print(f"{'game':<10}{'steps/s':>12}{'wins':>7}{'losses':>8}{'best':>6}{'win s':>8}")
+    for name in args.game or GAMES:
+        result = GAME_CLASSES[name](seed=args.seed).run_headless(args.steps)
+        report[name] = result
+        win_time = f"{result['mean_win_seconds']:.1f}" if result["mean_win_seconds"] is not None else "-"
+        print(f"{name:<10}{result['steps_per_sec']:>12.0f}{result['wins']:>7}{result['losses']:>8}"
+              f"{result['best_score']:>6}{win_time:>8}")
+    return report
+
+
+def check_recording(args):
+    """Types through VirtualKeyboard.run() with a recorder attached and compares each record to the scripted hands."""
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_session_"), "session.jsonl")
+    run_scenario("keyboard", args, recorder=LandmarkRecorder(path, target="HELLO WORLD"))
+    header, frames = load_session(path)
+    w, h = header["width"], header["height"]
+    kb = offline_keyboard(w, h)
+    script, _, _ = keyboard_scenario(kb, w, h, args)
+    close_keyboard(kb)
+    mismatched = []
+    for i, frame in enumerate(frames):
+        expected = script(i).multi_hand_landmarks or []
+        recorded = [hand["landmarks"] for hand in frame["hands"]]
+        same = len(recorded) == len(expected) and all(
+            abs(point[0] - lm.x) < 1e-4 and abs(point[1] - lm.y) < 1e-4
+            for points, hand in zip(recorded, expected)
+            for point, lm in zip(points, hand.landmark)
+        )
+        if not same:
+            mismatched.append(i)
+    result = {
+        "session": path,
+        "frames_run": args.frames + args.warmup,
+        "frames_recorded": len(frames),
+        "mismatched_frames": mismatched[:20],
+        "ok": len(frames) == args.frames + args.warmup and not mismatched
+    }
+    print(f"recorded {result['frames_recorded']}/{result['frames_run']} frames, "
+          f"{len(mismatched)} mismatched: {'OK' if result['ok'] else 'FAIL'}")
+    return result
+
+
+def synthetic_lexicon(size, seed):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("etaoinshrdlcumwfgypbvkjxqz"))
+    weights = 1.0 / np.arange(1, len(letters) + 1)
+    weights /= weights.sum()
+    words = []
+    seen = set()
+    while len(words) < size:
+        for length in rng.integers(2, 13, size - len(words)):
+            word = "".join(rng.choice(letters, length, p=weights))
+            if word not in seen:
+                seen.add(word)
+                words.append(word)
+    return words
+
+
+def percentiles_us(samples):
+    arr = np.asarray(samples, dtype=np.float64) / 1000.0
+    return {
+        "mean": round(float(arr.mean()), 2),
+        "p50": round(float(np.percentile(arr, 50)), 2),
+        "p99": round(float(np.percentile(arr, 99)), 2),
+        "max": round(float(arr.max()), 2)
+    }
+
+
+def run_words(args):
+    """Times WordPredictor build and per-keystroke suggest() against a lexicon of realistic size."""
+    if args.words == "synthetic":
+        path = os.path.join(tempfile.mkdtemp(prefix="bench_words_"), "words.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(synthetic_lexicon(args.lexicon_size, args.seed)) + "\n")
+    else:
+        path = args.words
+    predictor = WordPredictor(path)
+    start = time.perf_counter()
+    predictor.load()
+    build_s = time.perf_counter() - start
+    if not predictor.ready:
+        raise SystemExit(f"could not load {path}")
+    rng = np.random.default_rng(args.seed)
+    sample = [predictor.words[i] for i in rng.integers(0, len(predictor.words), 2000)]
+    typing = []
+    for word in sample:
+        for end in range(1, len(word) + 1):
+            t0 = time.perf_counter_ns()
+            predictor.suggest(word[:end])
+            typing.append(time.perf_counter_ns() - t0)
+    cold = []
+    for word in sample:
+        prefix = word[:max(1, len(word) // 2)]
+        predictor._last = ("", 0)
+        t0 = time.perf_counter_ns()
+        predictor.suggest(prefix)
+        cold.append(time.perf_counter_ns() - t0)
+    result = {
+        "lexicon": path,
+        "words": len(predictor.words),
+        "build_seconds": round(build_s, 3),
+        "keystroke_us": percentiles_us(typing),
+        "cold_prefix_us": percentiles_us(cold),
+        "sub_millisecond": max(typing + cold) < 1_000_000
+    }
+    print(f"{result['words']} words built in {build_s:.2f} s; keystroke p50 {result['keystroke_us']['p50']:.1f} us, "
+          f"p99 {result['keystroke_us']['p99']:.1f} us; cold p99 {result['cold_prefix_us']['p99']:.1f} us")
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the VirtualKeyboard frame pipeline")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=15, help="frames discarded before measuring")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--seed", type=int, default=1234, help="seed for the synthetic background and game RNG")
+    parser.add_argument("--frames-per-key", type=int, default=40, help="frames the fingertip rests on each key when typing")
+    parser.add_argument("--video", help="recorded video or frame directory; runs the real MediaPipe graphs")
+    parser.add_argument("--typing", action="append", metavar="SESSION",
+                        help="replay a recorded landmark session (or 'synthetic') through the press detectors instead")
+    parser.add_argument("--detector", action="append", choices=[detector_slug(d) for d in PRESS_DETECTORS],
+                        help="press detector to replay with (repeatable, default: all)")
+    parser.add_argument("--phrase", default="HELLO WORLD", help="phrase typed by the synthetic session")
+    parser.add_argument("--hold", type=float, default=0.7, help="seconds the synthetic typist rests on each key")
+    parser.add_argument("--words", metavar="LEXICON",
+                        help="time WordPredictor lookups on a word list (one word per line, or 'synthetic')")
+    parser.add_argument("--lexicon-size", type=int, default=100000, help="words in the synthetic lexicon")
+    parser.add_argument("--check-recording", action="store_true",
+                        help="run the keyboard scenario with a landmark recorder and verify every recorded frame")
+    parser.add_argument("--games", action="store_true",
+                        help="step every game headless with its built-in bot instead of rendering frames")
+    parser.add_argument("--game", action="append", choices=GAMES, help="game to simulate (repeatable, default: all)")
+    parser.add_argument("--steps", type=int, default=20000, help="fixed simulation steps per game")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.words:
+        report = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}, "words": run_words(args)}
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Report written to {args.output}")
+        return
+    if args.check_recording:
+        result = check_recording(args)
+        with open(args.output, "w") as fh:
+            json.dump({"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}, "recording": result}, fh, indent=2)
+        print(f"Report written to {args.output}")
+        if not result["ok"]:
+            raise SystemExit(1)
+        return
+    if args.games:
+        meta = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": args.seed, "steps": args.steps}
+        report = {"meta": meta, "games": run_games(args)}
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Report written to {args.output}")
+        return
+    if args.typing:
+        report = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}, "typing": run_typing(args)}
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Report written to {args.output}")
+        return
+    names = args.scenario or list(SCENARIOS)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "mediapipe": getattr(mp, "__version__", "unknown"),
+            "input": args.video or f"synthetic {args.width}x{args.height}",
+            "frames": args.frames,
+            "warmup": args.warmup
+        },
+        "scenarios": {}
+    }
+    print(f"{'scenario':<16}{'fps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in names:
+        result = run_scenario(name, args)
+        report["scenarios"][name] = result
+        ms = result["frame_ms"]
+        print(f"{name:<16}{result['fps']:>9.1f}{ms['p50']:>10.2f}{ms['p95']:>10.2f}{ms['p99']:>10.2f}")
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,13 @@ import math
 import pygame
 import random
 import os
+import threading
+import collections
+from array import array
+import json
+import xml.etree.ElementTree as ET
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     pygame.mixer.init()
@@ -15,8 +22,1832 @@ try:
 except pygame.error:
     MIXER_READY = False
 
-class VirtualKeyboard:
+class WebcamSource:
+    """Live camera frames from cv2.VideoCapture, mirrored for the selfie view."""
+
+    live = True
+    mirror = True
+
+    def __init__(self, index=0, width=1920, height=1080):
+        self.cap = cv2.VideoCapture(index)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def read(self):
+        return self.cap.read()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(WebcamSource):
+    """Recorded footage from a video file, optionally looped."""
+
+    live = False
+    mirror = False
+
+    def __init__(self, path, loop=False):
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+
+    def read(self):
+        success, frame = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        return success, frame
+
+
+class ImageSequenceSource:
+    """Frames read in name order from a directory of images."""
+
+    live = False
+    mirror = False
+    extensions = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, directory, loop=False):
+        self.directory = directory
+        self.loop = loop
+        self.paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(self.extensions)
+        )
+        self.index = 0
+        self.shape = None
+        self.opened = bool(self.paths)
+
+    def read(self):
+        for _ in range(len(self.paths)):
+            if self.index >= len(self.paths):
+                if not self.loop:
+                    break
+                self.index = 0
+            frame = cv2.imread(self.paths[self.index])
+            self.index += 1
+            if frame is not None:
+                self.shape = frame.shape
+                return True, frame
+        self.opened = False
+        return False, None
+
+    def isOpened(self):
+        return self.opened
+
+    def get(self, prop):
+        if self.shape is None and self.paths:
+            first = cv2.imread(self.paths[0])
+            self.shape = first.shape if first is not None else None
+        if self.shape is None:
+            return 0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.shape[1]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.shape[0]
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.paths)
+        return 0
+
+    def release(self):
+        self.opened = False
+
+
+class GeneratorSource:
+    """Frames pulled from any in-memory iterable of BGR images."""
+
+    live = False
+    mirror = False
+
+    def __init__(self, frames):
+        self.frames = iter(frames)
+        self.shape = None
+        self.opened = True
+        self.peeked = None
+
+    def _peek(self):
+        try:
+            self.peeked = next(self.frames)
+        except StopIteration:
+            return
+        self.shape = self.peeked.shape
+
+    def read(self):
+        if self.peeked is not None:
+            frame, self.peeked = self.peeked, None
+            return True, frame
+        try:
+            frame = next(self.frames)
+        except StopIteration:
+            self.opened = False
+            return False, None
+        self.shape = frame.shape
+        return True, frame
+
+    def isOpened(self):
+        return self.opened
+
+    def get(self, prop):
+        if self.shape is None:
+            self._peek()
+        if self.shape is None:
+            return 0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.shape[1]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.shape[0]
+        return 0
+
+    def release(self):
+        self.opened = False
+
+
+class WindowSink:
+    """Shows frames in an OpenCV window and returns the pressed key."""
+
+    def __init__(self, title="Virtual Keyboard"):
+        self.title = title
+
+    def show(self, frame):
+        cv2.imshow(self.title, frame)
+        return cv2.waitKey(1) & 0xFF
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class NullSink:
+    """Discards frames, for headless runs and benchmarks."""
+
+    def show(self, frame):
+        return -1
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    """Writes frames to a video file, or to numbered PNGs when path is a directory."""
+
+    def __init__(self, path, fps=30, fourcc="mp4v"):
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.writer = None
+        self.index = 0
+        self.as_images = not os.path.splitext(path)[1]
+        if self.as_images:
+            os.makedirs(path, exist_ok=True)
+
+    def show(self, frame):
+        if self.as_images:
+            cv2.imwrite(os.path.join(self.path, f"frame_{self.index:06d}.png"), frame)
+        else:
+            if self.writer is None:
+                h, w = frame.shape[:2]
+                self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+            self.writer.write(frame)
+        self.index += 1
+        return -1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+
+class CallbackSink:
+    """Hands every frame to a callback; a returned key code is handled like a key press."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def show(self, frame):
+        key = self.callback(frame)
+        return -1 if key is None else key
+
+    def close(self):
+        pass
+
+
+class CameraCapture:
+    """Background capture thread that keeps the newest frames in a small ring buffer."""
+
+    def __init__(self, source, slots=3, drop_policy="oldest", stale_after=0.1, threaded=True):
+        if drop_policy not in ("oldest", "newest"):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.source = source
+        self.slots = max(3, slots)
+        self.drop_policy = drop_policy
+        self.stale_after = stale_after
+        self.threaded = threaded
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_stale = 0
+        self.last_timestamp = 0.0
+        self._buffer = None
+        self._stamps = [0.0] * self.slots
+        self._ready = collections.deque()
+        self._held = None
+        self._writing = None
+        self._ended = False
+        self._running = False
+        self._thread = None
+        self._cond = threading.Condition()
+
+    def start(self):
+        if not self.threaded or self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+
+    def _allocate(self, shape, dtype):
+        self._buffer = np.empty((self.slots,) + shape, dtype=dtype)
+        self._ready.clear()
+        self._held = None
+
+    def _free_slot(self):
+        busy = set(self._ready)
+        busy.add(self._held)
+        for slot in range(self.slots):
+            if slot not in busy:
+                return slot
+        if self.drop_policy == "newest":
+            return None
+        self.frames_dropped += 1
+        return self._ready.popleft()
+
+    def _capture_loop(self):
+        while self._running:
+            success, frame = self.source.read()
+            stamp = time.perf_counter()
+            if not success or frame is None:
+                with self._cond:
+                    self._ended = True
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                if self._buffer is None or self._buffer.shape[1:] != frame.shape:
+                    self._allocate(frame.shape, frame.dtype)
+                slot = self._free_slot()
+                if slot is None:
+                    self.frames_dropped += 1
+                    continue
+                self._writing = slot
+            np.copyto(self._buffer[slot], frame)
+            with self._cond:
+                self._writing = None
+                self._stamps[slot] = stamp
+                self._ready.append(slot)
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=1.0):
+        if not self.threaded:
+            success, frame = self.source.read()
+            if success:
+                self.frames_captured += 1
+                self.last_timestamp = time.perf_counter()
+            return success, frame
+        with self._cond:
+            if not self._ready and not self._ended:
+                self._cond.wait(timeout)
+            if not self._ready:
+                if self._ended or self._held is None:
+                    return False, None
+                self.frames_stale += 1
+                return True, self._buffer[self._held]
+            if self.drop_policy == "oldest":
+                slot = self._ready.pop()
+                self.frames_dropped += len(self._ready)
+                self._ready.clear()
+            else:
+                slot = self._ready.popleft()
+            self._held = slot
+            self.last_timestamp = self._stamps[slot]
+            if time.perf_counter() - self.last_timestamp > self.stale_after:
+                self.frames_stale += 1
+            return True, self._buffer[slot]
+
+    def isOpened(self):
+        if self.threaded and self._ended:
+            return False
+        return self.source.isOpened()
+
+    def get(self, prop):
+        return self.source.get(prop)
+
+    def stats(self):
+        return {
+            "captured": self.frames_captured,
+            "dropped": self.frames_dropped,
+            "stale": self.frames_stale
+        }
+
+    def release(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.source.release()
+
+
+class InferenceExecutor:
+    """Runs the enabled MediaPipe graphs side by side and joins their results per frame."""
+
+    def __init__(self, max_workers=3):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference") if max_workers > 1 else None
+        self.timings = {}
+        self.avg_timings = {}
+        self.frame_time = 0.0
+        self.frame_id = -1
+
+    def _process(self, graph, image):
+        start = time.perf_counter()
+        result = graph.process(image)
+        return result, (time.perf_counter() - start) * 1000.0
+
+    def _record(self, name, elapsed):
+        self.timings[name] = elapsed
+        previous = self.avg_timings.get(name)
+        self.avg_timings[name] = elapsed if previous is None else 0.9 * previous + 0.1 * elapsed
+
+    def run(self, frame_id, jobs):
+        start = time.perf_counter()
+        results = {name: None for name in jobs}
+        active = {name: job for name, job in jobs.items() if job is not None}
+        self.timings = {}
+        if self.pool is None or len(active) < 2:
+            for name, (graph, image) in active.items():
+                results[name], elapsed = self._process(graph, image)
+                self._record(name, elapsed)
+        else:
+            futures = {name: self.pool.submit(self._process, graph, image) for name, (graph, image) in active.items()}
+            for name, future in futures.items():
+                results[name], elapsed = future.result()
+                self._record(name, elapsed)
+        self.frame_id = frame_id
+        self.frame_time = (time.perf_counter() - start) * 1000.0
+        return results
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+
+class RoiTracker:
+    """Holds a crop window around the last detected landmarks and maps results back to full-frame coordinates."""
+
+    def __init__(self, margin=0.3, min_size=0.25, hold=0.1, shrink=0.3):
+        self.margin = margin
+        self.min_size = min_size
+        self.hold = hold
+        self.shrink = shrink
+        self.box = None
+        self.roi = (0.0, 0.0, 1.0, 1.0)
+
+    def reset(self):
+        self.box = None
+
+    def crop(self, image):
+        h, w = image.shape[:2]
+        if self.box is None:
+            self.roi = (0.0, 0.0, 1.0, 1.0)
+            return image
+        x0, y0, x1, y1 = self.box
+        px0 = max(0, int(x0 * w))
+        py0 = max(0, int(y0 * h))
+        px1 = min(w, int(math.ceil(x1 * w)))
+        py1 = min(h, int(math.ceil(y1 * h)))
+        if px1 - px0 < 16 or py1 - py0 < 16:
+            self.box = None
+            self.roi = (0.0, 0.0, 1.0, 1.0)
+            return image
+        self.roi = (px0 / w, py0 / h, (px1 - px0) / w, (py1 - py0) / h)
+        return np.ascontiguousarray(image[py0:py1, px0:px1])
+
+    def map_back(self, landmark_list):
+        if landmark_list is None:
+            return None
+        rx, ry, rw, rh = self.roi
+        if (rx, ry, rw, rh) != (0.0, 0.0, 1.0, 1.0):
+            for lm in landmark_list.landmark:
+                lm.x = rx + lm.x * rw
+                lm.y = ry + lm.y * rh
+                lm.z = lm.z * rw
+        return landmark_list
+
+    def window(self, bounds):
+        x0, y0, x1, y1 = bounds
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        half_w = max((x1 - x0) * (1 + 2 * self.margin), self.min_size) / 2
+        half_h = max((y1 - y0) * (1 + 2 * self.margin), self.min_size) / 2
+        return (max(0.0, cx - half_w), max(0.0, cy - half_h), min(1.0, cx + half_w), min(1.0, cy + half_h))
+
+    def holds(self, bounds):
+        wx0, wy0, wx1, wy1 = self.box
+        inset_x = (wx1 - wx0) * self.hold
+        inset_y = (wy1 - wy0) * self.hold
+        x0, y0, x1, y1 = bounds
+        inside = ((wx0 <= 0.0 or x0 >= wx0 + inset_x) and (wy0 <= 0.0 or y0 >= wy0 + inset_y) and
+                  (wx1 >= 1.0 or x1 <= wx1 - inset_x) and (wy1 >= 1.0 or y1 <= wy1 - inset_y))
+        large_enough = (x1 - x0) >= (wx1 - wx0) * self.shrink or (y1 - y0) >= (wy1 - wy0) * self.shrink
+        return inside and large_enough
+
+    def update(self, landmark_list):
+        if landmark_list is None:
+            self.box = None
+            return
+        xs = [lm.x for lm in landmark_list.landmark]
+        ys = [lm.y for lm in landmark_list.landmark]
+        x0, x1 = max(0.0, min(xs)), min(1.0, max(xs))
+        y0, y1 = max(0.0, min(ys)), min(1.0, max(ys))
+        if x1 <= x0 or y1 <= y0:
+            self.box = None
+        elif self.box is None or not self.holds((x0, y0, x1, y1)):
+            self.box = self.window((x0, y0, x1, y1))
+
+
+class RollingHistogram:
+    """Fixed window of latency samples in milliseconds."""
+
+    edges = (0.0, 1.0, 2.0, 4.0, 8.0, 16.0, 33.0, 66.0, float("inf"))
+
+    def __init__(self, size=240):
+        self.size = size
+        self.samples = np.zeros(size, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+        self.total = 0
+
+    def add(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.total += 1
+
+    def values(self):
+        return self.samples[:self.count] if self.count < self.size else self.samples
+
+    def last(self):
+        return float(self.samples[(self.index - 1) % self.size]) if self.count else 0.0
+
+    def mean(self):
+        return float(self.values().mean()) if self.count else 0.0
+
+    def percentile(self, p):
+        return float(np.percentile(self.values(), p)) if self.count else 0.0
+
+    def buckets(self):
+        return np.histogram(self.values(), bins=self.edges)[0].tolist()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """Named timing spans, rolling histograms and counters; a no-op while disabled."""
+
+    def __init__(self, enabled=False, window=240):
+        self.enabled = enabled
+        self.window = window
+        self.histograms = {}
+        self.counters = collections.Counter()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, elapsed_ms):
+        if not self.enabled:
+            return
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = RollingHistogram(self.window)
+        hist.add(elapsed_ms)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] += amount
+
+    def reset(self):
+        self.histograms = {}
+        self.counters = collections.Counter()
+
+    def snapshot(self):
+        return {
+            "stages": {
+                name: {
+                    "last": round(hist.last(), 3),
+                    "mean": round(hist.mean(), 3),
+                    "p50": round(hist.percentile(50), 3),
+                    "p95": round(hist.percentile(95), 3),
+                    "p99": round(hist.percentile(99), 3),
+                    "buckets": hist.buckets()
+                }
+                for name, hist in self.histograms.items()
+            },
+            "counters": dict(self.counters)
+        }
+
+
+class FramePacer:
+    """Sleeps only for the time left until the next frame deadline."""
+
+    def __init__(self, target_fps=60):
+        self.target_fps = target_fps
+        self.deadline = None
+        self.missed_deadlines = 0
+        self.last_sleep = 0.0
+
+    def reset(self):
+        self.deadline = None
+
+    async def wait(self):
+        now = time.perf_counter()
+        if not self.target_fps:
+            self.last_sleep = 0.0
+            await asyncio.sleep(0)
+            return
+        period = 1.0 / self.target_fps
+        if self.deadline is None:
+            self.deadline = now + period
+        remaining = self.deadline - now
+        if remaining > 0:
+            self.last_sleep = remaining
+            await asyncio.sleep(remaining)
+            self.deadline += period
+        else:
+            self.missed_deadlines += 1
+            self.last_sleep = 0.0
+            await asyncio.sleep(0)
+            self.deadline = now + period if -remaining > period else self.deadline + period
+
+
+class FixedTimestep:
+    """Turns elapsed clock time into whole simulation steps plus an interpolation factor for rendering."""
+
+    def __init__(self, dt=1.0 / 60, clock=time.perf_counter, max_frame=0.25):
+        self.dt = dt
+        self.clock = clock
+        self.max_frame = max_frame
+        self.reset()
+
+    def reset(self):
+        self.last = None
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self):
+        now = self.clock()
+        if self.last is None:
+            self.last = now - self.dt
+        self.accumulator += min(self.max_frame, max(0.0, now - self.last))
+        self.last = now
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        self.alpha = self.accumulator / self.dt
+        return steps
+
+
+class OneEuroFilter:
+    """One Euro low-pass filter over a point, with velocity-based forward prediction."""
+
+    def __init__(self, min_cutoff=1.2, beta=0.015, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, point, timestamp):
+        point = np.asarray(point, dtype=np.float64)
+        if self.value is None or timestamp <= self.timestamp:
+            if self.value is None:
+                self.value = point
+                self.velocity = np.zeros_like(point)
+            self.timestamp = timestamp
+            return self.value
+        dt = timestamp - self.timestamp
+        raw_velocity = (point - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.velocity = a_d * raw_velocity + (1 - a_d) * self.velocity
+        cutoff = self.min_cutoff + self.beta * float(np.hypot(*self.velocity))
+        a = self._alpha(cutoff, dt)
+        self.value = a * point + (1 - a) * self.value
+        self.timestamp = timestamp
+        return self.value
+
+    def predict(self, lead):
+        if self.value is None:
+            return None
+        return self.value + self.velocity * lead
+
+
+class HandPointFilter:
+    """Per-hand fingertip filters that lead the cursor by the measured pipeline latency."""
+
+    def __init__(self, min_cutoff=1.2, beta=0.015, d_cutoff=1.0, max_lead=0.12, max_jump=80, latency_smoothing=0.1):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_lead = max_lead
+        self.max_jump = max_jump
+        self.latency_smoothing = latency_smoothing
+        self.enabled = True
+        self.filters = {}
+        self.seen = set()
+        self.latency = 0.0
+
+    def begin_frame(self):
+        for label in set(self.filters) - self.seen:
+            del self.filters[label]
+        self.seen = set()
+
+    def observe_latency(self, latency):
+        if latency <= 0:
+            return
+        if not self.latency:
+            self.latency = latency
+        else:
+            self.latency += self.latency_smoothing * (latency - self.latency)
+
+    def update(self, label, point, timestamp, bounds=None):
+        self.seen.add(label)
+        if not self.enabled:
+            x, y = int(round(point[0])), int(round(point[1]))
+        else:
+            filt = self.filters.get(label)
+            if filt is None:
+                filt = self.filters[label] = OneEuroFilter(self.min_cutoff, self.beta, self.d_cutoff)
+            smoothed = filt.filter(point, timestamp)
+            predicted = filt.predict(min(self.latency, self.max_lead))
+            shift = predicted - smoothed
+            distance = float(np.hypot(*shift))
+            if distance > self.max_jump:
+                predicted = smoothed + shift * (self.max_jump / distance)
+            x, y = int(round(predicted[0])), int(round(predicted[1]))
+        if bounds is not None:
+            x = min(max(x, 0), bounds[0] - 1)
+            y = min(max(y, 0), bounds[1] - 1)
+        return (x, y)
+
+    def reset(self):
+        self.filters = {}
+        self.seen = set()
+
+class DwellPress:
+    """Presses the hovered key once the fingertip has rested on it for a fixed delay."""
+
+    name = "Dwell"
+
+    def __init__(self, delay=0.6):
+        self.delay = delay
+        self.state = {}
+
+    def reset(self, hand=None):
+        if hand is None:
+            self.state = {}
+        else:
+            self.state.pop(hand, None)
+
+    def current_delay(self, repeat):
+        return self.delay
+
+    def update(self, hand, key, hand_landmarks, now):
+        state = self.state.get(hand)
+        if key is None:
+            self.state.pop(hand, None)
+            return None
+        if state is None or state[0] != key:
+            self.state[hand] = [key, now, False]
+            return None
+        if now - state[1] > self.current_delay(state[2]):
+            state[1] = now
+            state[2] = True
+            return key
+        return None
+
+    def holds_keyboard(self, hand_landmarks):
+        return False
+
+    def pressed(self, key, now):
+        pass
+
+
+class AdaptiveDwellPress(DwellPress):
+    """Dwell press whose delay shrinks while the user types without corrections."""
+
+    name = "Adaptive"
+
+    def __init__(self, delay=0.6, minimum=0.25, maximum=0.9, shrink=0.93, grow=1.3):
+        super().__init__(delay)
+        self.initial = delay
+        self.minimum = minimum
+        self.maximum = maximum
+        self.shrink = shrink
+        self.grow = grow
+
+    def current_delay(self, repeat):
+        return max(self.delay, self.initial) if repeat else self.delay
+
+    def pressed(self, key, now):
+        if key == "Backspace":
+            self.delay = min(self.maximum, self.delay * self.grow)
+        else:
+            self.delay = max(self.minimum, self.delay * self.shrink)
+
+    def reset(self, hand=None):
+        super().reset(hand)
+        if hand is None:
+            self.delay = self.initial
+
+
+def _hand_scale(hand_landmarks):
+    wrist = hand_landmarks.landmark[0]
+    middle_mcp = hand_landmarks.landmark[9]
+    return max(1e-3, math.hypot(middle_mcp.x - wrist.x, middle_mcp.y - wrist.y))
+
+
+class AirTapPress:
+    """Presses on a quick forward push of the index fingertip, read from landmark z velocity."""
+
+    name = "Air tap"
+
+    def __init__(self, velocity=1.5, depth=0.2, smoothing=0.5, cooldown=0.3, settle=0.05):
+        self.velocity = velocity
+        self.depth = depth
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.settle = settle
+        self.state = {}
+
+    def reset(self, hand=None):
+        if hand is None:
+            self.state = {}
+        else:
+            self.state.pop(hand, None)
+
+    def update(self, hand, key, hand_landmarks, now):
+        if hand_landmarks is None:
+            return None
+        scale = _hand_scale(hand_landmarks)
+        depth = (hand_landmarks.landmark[0].z - hand_landmarks.landmark[8].z) / scale
+        state = self.state.get(hand)
+        if state is None:
+            self.state[hand] = {"depth": depth, "time": now, "origin": None, "key": None,
+                                "hover": key, "hover_since": now, "last_press": -1e9}
+            return None
+        if key != state["hover"]:
+            state["hover"] = key
+            state["hover_since"] = now
+        dt = now - state["time"]
+        if dt <= 0:
+            return None
+        smoothed = state["depth"] + self.smoothing * (depth - state["depth"])
+        speed = (smoothed - state["depth"]) / dt
+        state["depth"] = smoothed
+        state["time"] = now
+        if speed <= 0:
+            state["origin"] = None
+            return None
+        if state["origin"] is None:
+            if now - state["hover_since"] < self.settle:
+                return None
+            state["origin"] = smoothed - speed * dt
+            state["key"] = key
+        if (speed > self.velocity and smoothed - state["origin"] > self.depth
+                and now - state["last_press"] > self.cooldown and state["key"] is not None):
+            state["last_press"] = now
+            state["origin"] = float("inf")
+            return state["key"]
+        return None
+
+    def holds_keyboard(self, hand_landmarks):
+        return False
+
+    def pressed(self, key, now):
+        pass
+
+
+class PinchPress:
+    """Presses the key hovered just before the thumb closes onto the index fingertip."""
+
+    name = "Pinch"
+
+    def __init__(self, engage=0.3, release=0.45, lookback=0.15):
+        self.engage = engage
+        self.release = release
+        self.lookback = lookback
+        self.state = {}
+
+    def reset(self, hand=None):
+        if hand is None:
+            self.state = {}
+        else:
+            self.state.pop(hand, None)
+
+    def update(self, hand, key, hand_landmarks, now):
+        if hand_landmarks is None:
+            return None
+        state = self.state.setdefault(hand, {"closed": False, "history": collections.deque(maxlen=32)})
+        state["history"].append((now, key))
+        thumb = hand_landmarks.landmark[4]
+        index = hand_landmarks.landmark[8]
+        ratio = math.hypot(thumb.x - index.x, thumb.y - index.y) / _hand_scale(hand_landmarks)
+        if state["closed"]:
+            if ratio > self.release:
+                state["closed"] = False
+            return None
+        if ratio >= self.engage:
+            return None
+        state["closed"] = True
+        target = key
+        for stamp, hovered in state["history"]:
+            if now - stamp <= self.lookback:
+                target = hovered
+                break
+        return target
+
+    def holds_keyboard(self, hand_landmarks):
+        thumb = hand_landmarks.landmark[4]
+        index = hand_landmarks.landmark[8]
+        return math.hypot(thumb.x - index.x, thumb.y - index.y) / _hand_scale(hand_landmarks) < self.release
+
+    def pressed(self, key, now):
+        pass
+
+
+PRESS_DETECTORS = [DwellPress, AdaptiveDwellPress, AirTapPress, PinchPress]
+
+
+class LandmarkRecorder:
+    """Writes hand landmarks per frame as JSON lines for replaying typing sessions."""
+
+    def __init__(self, path, target=""):
+        self.path = path
+        self.file = open(path, "w")
+        self.header_written = False
+        self.target = target
+        self.start = None
+
+    def write(self, timestamp, width, height, results):
+        if not self.header_written:
+            self.file.write(json.dumps({"version": 1, "width": width, "height": height, "target": self.target}) + "\n")
+            self.header_written = True
+            self.start = timestamp
+        hands = []
+        if results is not None and results.multi_hand_landmarks:
+            for hand_idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                label = results.multi_handedness[hand_idx].classification[0].label.lower()
+                hands.append({
+                    "label": label,
+                    "landmarks": [[round(lm.x, 5), round(lm.y, 5), round(lm.z, 5)] for lm in hand_landmarks.landmark]
+                })
+        self.file.write(json.dumps({"t": round(timestamp - self.start, 4), "hands": hands}, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+
+class KeyGeometry:
+    """Compiled key rectangles for one keyboard configuration with a uniform grid for hit-testing."""
+
+    def __init__(self, rows, start_x, start_y, key_width, key_height, spacing, hand_center=None, curve_intensity=0.3):
+        self.key_width = key_width
+        self.key_height = key_height
+        labels = []
+        cols = []
+        row_ids = []
+        for row_idx, row in enumerate(rows):
+            for col_idx, key in enumerate(row):
+                labels.append(key)
+                cols.append(col_idx)
+                row_ids.append(row_idx)
+        base_x = start_x + np.asarray(cols, dtype=np.float64) * (key_width + spacing)
+        base_y = start_y + np.asarray(row_ids, dtype=np.float64) * (key_height + spacing)
+        if hand_center is not None:
+            dx = base_x - hand_center[0]
+            dy = base_y - hand_center[1]
+            distance = np.sqrt(dx * dx + dy * dy)
+            base_x = base_x + dx * curve_intensity * (distance / 200)
+            base_y = base_y + dy * curve_intensity * (distance / 200)
+        self.xs = np.trunc(base_x).astype(np.int64)
+        self.ys = np.trunc(base_y).astype(np.int64)
+        self.positions = list(zip(labels, self.xs.tolist(), self.ys.tolist()))
+        self.lookup = {}
+        for entry in self.positions:
+            self.lookup.setdefault(entry[0], entry)
+        self.bounds = (
+            int(self.xs.min()), int(self.ys.min()),
+            int(self.xs.max()) + key_width, int(self.ys.max()) + key_height
+        )
+        self.cell_w = max(1, key_width + spacing)
+        self.cell_h = max(1, key_height + spacing)
+        self.grid = {}
+        for idx, (_, x, y) in enumerate(self.positions):
+            for cy in range(self._cell_y(y), self._cell_y(y + key_height) + 1):
+                for cx in range(self._cell_x(x), self._cell_x(x + key_width) + 1):
+                    self.grid.setdefault((cx, cy), []).append(idx)
+
+    def _cell_x(self, x):
+        return (x - self.bounds[0]) // self.cell_w
+
+    def _cell_y(self, y):
+        return (y - self.bounds[1]) // self.cell_h
+
+    def hit(self, x, y):
+        for idx in self.grid.get((self._cell_x(x), self._cell_y(y)), ()):
+            _, kx, ky = self.positions[idx]
+            if kx < x < kx + self.key_width and ky < y < ky + self.key_height:
+                return self.positions[idx]
+        return None
+
+
+class TextCache:
+    """LRU cache of text measurements and pre-rendered glyph sprites."""
+
+    def __init__(self, max_bytes=4 * 1024 * 1024, max_sizes=4096):
+        self.max_bytes = max_bytes
+        self.max_sizes = max_sizes
+        self.sprites = collections.OrderedDict()
+        self.sizes = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def measure(self, text, font=cv2.FONT_HERSHEY_SIMPLEX, scale=1, thickness=2):
+        key = (text, font, scale, thickness)
+        size = self.sizes.get(key)
+        if size is None:
+            size = cv2.getTextSize(text, font, scale, thickness)
+            self.sizes[key] = size
+            if len(self.sizes) > self.max_sizes:
+                self.sizes.popitem(last=False)
+        else:
+            self.sizes.move_to_end(key)
+        return size
+
+    def _sprite(self, text, font, scale, color, thickness, line_type):
+        key = (text, font, scale, thickness, tuple(color), line_type)
+        entry = self.sprites.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return entry
+        self.misses += 1
+        (text_w, text_h), baseline = self.measure(text, font, scale, thickness)
+        pad = thickness + int(4 * scale) + 2
+        alpha = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad), dtype=np.uint8)
+        cv2.putText(alpha, text, (pad, pad + text_h), font, scale, 255, thickness, line_type)
+        if line_type == cv2.LINE_AA:
+            weights = alpha.astype(np.uint16)[..., None]
+        else:
+            weights = (alpha > 0)[..., None]
+        entry = (weights, np.array(color, dtype=np.uint8), pad, text_h)
+        nbytes = weights.nbytes
+        self.sprites[key] = entry
+        self.bytes += nbytes
+        while self.bytes > self.max_bytes and len(self.sprites) > 1:
+            _, old = self.sprites.popitem(last=False)
+            self.bytes -= old[0].nbytes
+            self.evictions += 1
+        return entry
+
+    def put(self, img, text, org, font=cv2.FONT_HERSHEY_SIMPLEX, scale=1, color=(255, 255, 255), thickness=1, line_type=cv2.LINE_8):
+        if not text:
+            return img
+        weights, color_px, pad, text_h = self._sprite(text, font, scale, color, thickness, line_type)
+        x0 = int(org[0]) - pad
+        y0 = int(org[1]) - text_h - pad
+        h, w = img.shape[:2]
+        sh, sw = weights.shape[:2]
+        dx0, dy0 = max(0, x0), max(0, y0)
+        dx1, dy1 = min(w, x0 + sw), min(h, y0 + sh)
+        if dx1 <= dx0 or dy1 <= dy0:
+            return img
+        sub = weights[dy0 - y0:dy1 - y0, dx0 - x0:dx1 - x0]
+        region = img[dy0:dy1, dx0:dx1]
+        if sub.dtype == np.bool_:
+            np.copyto(region, color_px, where=sub)
+        else:
+            blended = (region.astype(np.uint16) * (255 - sub) + color_px.astype(np.uint16) * sub + 127) // 255
+            region[:] = blended.astype(np.uint8)
+        return img
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.sprites),
+            "bytes": self.bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class DamageCompositor:
+    """Blends only the overlay rectangles that drawing routines touched back over the camera frame."""
+
+    def __init__(self, overlay_weight=0.8, frame_weight=0.2, full_ratio=0.6):
+        self.overlay_weight = overlay_weight
+        self.frame_weight = frame_weight
+        self.full_ratio = full_ratio
+        self.enabled = True
+        self.rects = []
+        self.full = False
+        self.shape = None
+        self.last_coverage = 1.0
+
+    def begin(self, shape):
+        self.rects = []
+        self.full = False
+        self.shape = shape[:2]
+
+    def damage(self, x0, y0, x1, y1):
+        if self.full or self.shape is None:
+            return
+        h, w = self.shape
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(w, int(math.ceil(x1))), min(h, int(math.ceil(y1)))
+        if x1 > x0 and y1 > y0:
+            self.rects.append((x0, y0, x1, y1))
+
+    def damage_all(self):
+        self.full = True
+
+    def damage_points(self, points, margin):
+        if points:
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            self.damage(min(xs) - margin, min(ys) - margin, max(xs) + margin + 1, max(ys) + margin + 1)
+
+    def merged_rects(self):
+        rects = list(self.rects)
+        merged = True
+        while merged:
+            merged = False
+            result = []
+            for rect in rects:
+                for idx, other in enumerate(result):
+                    if rect[0] < other[2] and other[0] < rect[2] and rect[1] < other[3] and other[1] < rect[3]:
+                        result[idx] = (min(rect[0], other[0]), min(rect[1], other[1]), max(rect[2], other[2]), max(rect[3], other[3]))
+                        merged = True
+                        break
+                else:
+                    result.append(rect)
+            rects = result
+        return rects
+
+    def composite(self, overlay, frame):
+        rects = [] if self.full or not self.enabled else self.merged_rects()
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+        total = frame.shape[0] * frame.shape[1]
+        if self.full or not self.enabled or area > self.full_ratio * total:
+            self.last_coverage = 1.0
+            return cv2.addWeighted(overlay, self.overlay_weight, frame, self.frame_weight, 0)
+        for x0, y0, x1, y1 in rects:
+            region = overlay[y0:y1, x0:x1]
+            region[:] = cv2.addWeighted(region, self.overlay_weight, frame[y0:y1, x0:x1], self.frame_weight, 0)
+        self.last_coverage = area / total
+        return overlay
+
+
+class DrawingCanvas:
+    """Stroke layer with a coverage mask, blended once and only where strokes exist."""
+
+    def __init__(self, overlay_weight=0.8, canvas_weight=0.5):
+        self.overlay_weight = overlay_weight
+        self.canvas_weight = canvas_weight
+        self.image = None
+        self.mask = None
+        self.bbox = None
+
+    def ensure_shape(self, shape):
+        if self.image is None or self.image.shape[:2] != tuple(shape[:2]):
+            self.image = np.zeros((shape[0], shape[1], 3), dtype=np.uint8)
+            self.mask = np.zeros((shape[0], shape[1]), dtype=np.uint8)
+            self.bbox = None
+
+    def clear(self):
+        if self.image is not None:
+            self.image[:] = 0
+            self.mask[:] = 0
+        self.bbox = None
+
+    def line(self, start, end, color, thickness):
+        if self.image is None:
+            return
+        cv2.line(self.image, start, end, color, thickness)
+        cv2.line(self.mask, start, end, 255, thickness)
+        reach = thickness // 2 + 2
+        h, w = self.mask.shape
+        x0 = max(0, min(start[0], end[0]) - reach)
+        y0 = max(0, min(start[1], end[1]) - reach)
+        x1 = min(w, max(start[0], end[0]) + reach + 1)
+        y1 = min(h, max(start[1], end[1]) + reach + 1)
+        if x1 <= x0 or y1 <= y0:
+            return
+        if self.bbox is None:
+            self.bbox = (x0, y0, x1, y1)
+        else:
+            bx0, by0, bx1, by1 = self.bbox
+            self.bbox = (min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1))
+
+    def polyline(self, points, color, thickness):
+        if self.image is None or not len(points):
+            return
+        points = np.asarray(points, dtype=np.int32)
+        if len(points) == 1:
+            self.line(tuple(points[0]), tuple(points[0]), color, thickness)
+            return
+        cv2.polylines(self.image, [points], False, color, thickness)
+        cv2.polylines(self.mask, [points], False, 255, thickness)
+        reach = thickness // 2 + 2
+        h, w = self.mask.shape
+        x0 = max(0, int(points[:, 0].min()) - reach)
+        y0 = max(0, int(points[:, 1].min()) - reach)
+        x1 = min(w, int(points[:, 0].max()) + reach + 1)
+        y1 = min(h, int(points[:, 1].max()) + reach + 1)
+        if x1 <= x0 or y1 <= y0:
+            return
+        if self.bbox is None:
+            self.bbox = (x0, y0, x1, y1)
+        else:
+            bx0, by0, bx1, by1 = self.bbox
+            self.bbox = (min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1))
+
+    def composite(self, overlay):
+        if self.bbox is None or self.image is None or self.image.shape[:2] != overlay.shape[:2]:
+            return None
+        x0, y0, x1, y1 = self.bbox
+        region = overlay[y0:y1, x0:x1]
+        blended = cv2.addWeighted(region, self.overlay_weight, self.image[y0:y1, x0:x1], self.canvas_weight, 0)
+        np.copyto(region, blended, where=self.mask[y0:y1, x0:x1, None] > 0)
+        return self.bbox
+
+
+class StrokeDrawing:
+    """Draw-mode strokes kept as compact point arrays with colour and brush size."""
+
     def __init__(self):
+        self.strokes = []
+        self.redo_stack = []
+        self.active = None
+        self.width = 0
+        self.height = 0
+
+    def begin(self, point, color, size):
+        self.end()
+        self.active = {"color": tuple(int(c) for c in color), "size": int(size), "points": [tuple(point)]}
+
+    def extend(self, point):
+        if self.active is None:
+            return None
+        last = self.active["points"][-1]
+        point = tuple(point)
+        if point == last:
+            return None
+        if len(self.active["points"]) == 1:
+            self.redo_stack = []
+        self.active["points"].append(point)
+        return last, point
+
+    def drop_touchdown(self):
+        if self.active is not None and len(self.active["points"]) == 1:
+            self.active = None
+
+    def end(self):
+        if self.active is None:
+            return
+        self.strokes.append({
+            "color": self.active["color"],
+            "size": self.active["size"],
+            "points": np.asarray(self.active["points"], dtype=np.int16)
+        })
+        self.active = None
+
+    def matches(self, color, size):
+        return self.active is not None and self.active["color"] == tuple(color) and self.active["size"] == size
+
+    def undo(self):
+        self.drop_touchdown()
+        self.end()
+        if not self.strokes:
+            return False
+        self.redo_stack.append(self.strokes.pop())
+        return True
+
+    def redo(self):
+        self.drop_touchdown()
+        if not self.redo_stack or self.active is not None:
+            return False
+        self.strokes.append(self.redo_stack.pop())
+        return True
+
+    def clear(self):
+        self.strokes = []
+        self.redo_stack = []
+        self.active = None
+
+    def rasterize(self, canvas):
+        canvas.clear()
+        for stroke in self.strokes:
+            canvas.polyline(stroke["points"], stroke["color"], stroke["size"])
+        if self.active is not None:
+            canvas.polyline(np.asarray(self.active["points"], dtype=np.int32), self.active["color"], self.active["size"])
+
+    def render(self, width, height, background=None):
+        image = np.zeros((height, width, 3), dtype=np.uint8) if background is None else cv2.resize(background, (width, height))
+        sx = width / self.width if self.width else 1.0
+        sy = height / self.height if self.height else 1.0
+        for stroke in self.strokes:
+            points = np.round(stroke["points"].astype(np.float64) * (sx, sy)).astype(np.int32)
+            thickness = max(1, int(round(stroke["size"] * (sx + sy) / 2)))
+            if len(points) == 1:
+                cv2.circle(image, tuple(points[0]), max(1, thickness // 2), stroke["color"], -1)
+            else:
+                cv2.polylines(image, [points], False, stroke["color"], thickness)
+        return image
+
+    def to_dict(self):
+        self.end()
+        return {
+            "width": self.width,
+            "height": self.height,
+            "strokes": [
+                {"color": list(stroke["color"]), "size": stroke["size"], "points": stroke["points"].tolist()}
+                for stroke in self.strokes
+            ]
+        }
+
+    def load_dict(self, data, width=None, height=None):
+        self.clear()
+        src_w = data.get("width") or width or 0
+        src_h = data.get("height") or height or 0
+        sx = width / src_w if width and src_w else 1.0
+        sy = height / src_h if height and src_h else 1.0
+        for stroke in data.get("strokes", []):
+            points = np.asarray(stroke["points"], dtype=np.float64).reshape(-1, 2) * (sx, sy)
+            if not len(points):
+                continue
+            self.strokes.append({
+                "color": tuple(int(c) for c in stroke["color"]),
+                "size": max(1, int(round(stroke["size"] * (sx + sy) / 2))),
+                "points": np.round(points).astype(np.int16)
+            })
+        self.width = width or src_w
+        self.height = height or src_h
+
+    def to_svg(self):
+        self.end()
+        lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                 f'viewBox="0 0 {self.width} {self.height}">']
+        for stroke in self.strokes:
+            b, g, r = stroke["color"]
+            points = " ".join(f"{x},{y}" for x, y in stroke["points"].tolist())
+            lines.append(f'  <polyline points="{points}" fill="none" stroke="#{r:02x}{g:02x}{b:02x}" '
+                         f'stroke-width="{stroke["size"]}" stroke-linecap="round" stroke-linejoin="round"/>')
+        lines.append("</svg>")
+        return "\n".join(lines)
+
+    def parse_svg(self, text):
+        root = ET.fromstring(text)
+        data = {
+            "width": int(float(root.get("width", 0) or 0)),
+            "height": int(float(root.get("height", 0) or 0)),
+            "strokes": []
+        }
+        for element in root.iter():
+            if not element.tag.endswith("polyline"):
+                continue
+            points = [tuple(float(v) for v in pair.split(",")) for pair in element.get("points", "").split()]
+            color = element.get("stroke", "#ffffff").lstrip("#")
+            r, g, b = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+            data["strokes"].append({
+                "color": [b, g, r],
+                "size": float(element.get("stroke-width", 5)),
+                "points": points
+            })
+        return data
+
+    def save(self, path):
+        with open(path, "w") as fh:
+            if path.lower().endswith(".svg"):
+                fh.write(self.to_svg())
+            else:
+                json.dump(self.to_dict(), fh, separators=(",", ":"))
+        return path
+
+    def load(self, path, width=None, height=None):
+        with open(path) as fh:
+            text = fh.read()
+        data = self.parse_svg(text) if path.lower().endswith(".svg") else json.loads(text)
+        self.load_dict(data, width, height)
+
+
+class PhotoWriter:
+    """Encodes and writes photos on a background thread behind a bounded queue."""
+
+    def __init__(self, fmt="png", png_compression=3, jpeg_quality=92, max_queue=4):
+        self.fmt = fmt
+        self.png_compression = png_compression
+        self.jpeg_quality = jpeg_quality
+        self.jobs = collections.deque()
+        self.max_queue = max_queue
+        self.results = collections.deque()
+        self.dropped = 0
+        self.written = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def encode_params(self):
+        if self.fmt in ("jpg", "jpeg"):
+            return ".jpg", [cv2.IMWRITE_JPEG_QUALITY, int(self.jpeg_quality)]
+        return ".png", [cv2.IMWRITE_PNG_COMPRESSION, int(self.png_compression)]
+
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+
+    def submit(self, frames, directory, basename):
+        with self._cond:
+            if len(self.jobs) >= self.max_queue:
+                self.dropped += 1
+                return False
+            self.jobs.append((frames, directory, basename, self.encode_params()))
+            self._cond.notify()
+        self.start()
+        return True
+
+    def pending(self):
+        with self._cond:
+            return len(self.jobs)
+
+    def poll(self):
+        done = []
+        while self.results:
+            done.append(self.results.popleft())
+        return done
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and not self.jobs:
+                    self._cond.wait()
+                if not self.jobs:
+                    return
+                frames, directory, basename, (ext, params) = self.jobs[0]
+            paths = []
+            try:
+                os.makedirs(directory, exist_ok=True)
+                for idx, frame in enumerate(frames):
+                    suffix = f"_{idx + 1:02d}" if len(frames) > 1 else ""
+                    path = os.path.join(directory, f"{basename}{suffix}{ext}")
+                    ok, data = cv2.imencode(ext, frame, params)
+                    if not ok:
+                        raise IOError(path)
+                    with open(path, "wb") as fh:
+                        fh.write(data.tobytes())
+                    paths.append(path)
+                self.written += len(paths)
+                self.results.append((basename, paths, None))
+            except Exception as exc:
+                self.results.append((basename, paths, exc))
+            with self._cond:
+                self.jobs.popleft()
+                self._cond.notify_all()
+
+    def close(self, timeout=5.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+class VideoRecorder:
+    """Records frames at a fixed output rate, repeating or skipping them by capture timestamp so playback runs at real speed."""
+
+    def __init__(self, directory, fps=30, fourcc="mp4v", max_queue=8, max_gap=1.0):
+        self.directory = directory
+        self.fps = fps
+        self.fourcc = fourcc
+        self.max_queue = max_queue
+        self.max_gap = max_gap
+        self.path = None
+        self.recording = False
+        self.started_at = 0.0
+        self.frames = collections.deque()
+        self.written = 0
+        self.repeated = 0
+        self.skipped = 0
+        self.dropped = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._finishing = []
+
+    def start(self, fps=None):
+        if self.recording:
+            return self.path
+        os.makedirs(self.directory, exist_ok=True)
+        ext = ".avi" if self.fourcc in ("MJPG", "XVID") else ".mp4"
+        self.path = os.path.join(self.directory, f"session_{time.strftime('%Y%m%d_%H%M%S')}{ext}")
+        self.fps = fps or self.fps
+        self.frames = collections.deque()
+        self.written = 0
+        self.repeated = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.started_at = time.time()
+        self.recording = True
+        self._finishing = [thread for thread in self._finishing if thread.is_alive()]
+        self._thread = threading.Thread(target=self._worker, args=(self.path, self.fps, self.frames), daemon=True)
+        self._thread.start()
+        return self.path
+
+    def push(self, frame, timestamp=None):
+        if not self.recording:
+            return False
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        with self._cond:
+            if len(self.frames) >= self.max_queue:
+                self.dropped += 1
+                return False
+            self.frames.append((timestamp, frame.copy()))
+            self._cond.notify()
+        return True
+
+    def _worker(self, path, fps, frames):
+        writer = None
+        first = None
+        slots = 0
+        max_repeat = max(1, int(self.max_gap * fps))
+        while True:
+            with self._cond:
+                while frames is self.frames and self.recording and not frames:
+                    self._cond.wait()
+                if not frames:
+                    break
+                timestamp, frame = frames.popleft()
+            if writer is None:
+                h, w = frame.shape[:2]
+                writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), fps, (w, h))
+                first = timestamp
+            due = int((timestamp - first) * fps) + 1
+            if due <= slots:
+                self.skipped += 1
+                continue
+            copies = min(due - slots, max_repeat)
+            for _ in range(copies):
+                writer.write(frame)
+            self.repeated += copies - 1
+            self.written += copies
+            slots = due
+        if writer is not None:
+            writer.release()
+
+    def stop(self):
+        if not self.recording:
+            return None
+        with self._cond:
+            self.recording = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._finishing.append(self._thread)
+            self._thread = None
+        return self.path
+
+    def close(self, timeout=5.0):
+        self.stop()
+        for thread in self._finishing:
+            thread.join(timeout=timeout)
+        self._finishing = []
+
+    def stats(self):
+        return {"written": self.written, "repeated": self.repeated, "skipped": self.skipped,
+                "dropped": self.dropped, "queued": len(self.frames)}
+
+
+class MemeAssetCache:
+    """Decodes meme images on first use and keeps one letterboxed copy per strip size."""
+
+    def __init__(self, paths, cache_dir=None, border_color=(255, 255, 255)):
+        self.paths = paths
+        self.cache_dir = cache_dir
+        self.border_color = border_color
+        self.decoded = {}
+        self.sized = {}
+
+    def _disk_path(self, path):
+        stat = os.stat(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{int(stat.st_mtime)}_{stat.st_size}.npy")
+
+    def decode(self, name):
+        if name in self.decoded:
+            return self.decoded[name]
+        image = None
+        path = os.path.join(os.getcwd(), self.paths[name]) if name in self.paths else None
+        if path is not None and os.path.exists(path):
+            cached = self._disk_path(path) if self.cache_dir else None
+            if cached is not None and os.path.exists(cached):
+                try:
+                    image = np.load(cached, mmap_mode="r")
+                except (OSError, ValueError):
+                    image = None
+            if image is None:
+                image = cv2.imread(path)
+                if image is not None and cached is not None:
+                    try:
+                        os.makedirs(self.cache_dir, exist_ok=True)
+                        np.save(cached, image)
+                    except OSError:
+                        pass
+        self.decoded[name] = image
+        return image
+
+    def get(self, name, width, height):
+        key = (name, width, height)
+        if key in self.sized:
+            return self.sized[key]
+        image = self.decode(name)
+        if image is None:
+            self.sized[key] = None
+            return None
+        scale = min(height / image.shape[0], width / image.shape[1])
+        fit_w = max(1, min(width, int(image.shape[1] * scale)))
+        fit_h = max(1, min(height, int(image.shape[0] * scale)))
+        strip = np.zeros((height, width, 3), dtype=np.uint8)
+        x0 = (width - fit_w) // 2
+        y0 = (height - fit_h) // 2
+        strip[y0:y0 + fit_h, x0:x0 + fit_w] = cv2.resize(image, (fit_w, fit_h), interpolation=cv2.INTER_AREA)
+        cv2.rectangle(strip, (0, 0), (width - 1, height - 1), self.border_color, 2)
+        self.sized[key] = strip
+        return strip
+
+
+class SoundBank:
+    """Synthesises effect sounds with NumPy once and plays them on a reserved channel pool."""
+
+    NOTE_NAMES = "ABCDEFGHIJKLMNOPQRSTUVWXYZ,./"
+    PENTATONIC = [0, 2, 4, 7, 9]
+
+    def __init__(self, channels=8, volume=0.3):
+        self.volume = volume
+        self.sounds = {}
+        self.channels = []
+        self.started = []
+        self.enabled = MIXER_READY
+        if not self.enabled:
+            return
+        try:
+            self.sample_rate, _, self.output_channels = pygame.mixer.get_init()
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels + 4))
+            pygame.mixer.set_reserved(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+            self.started = [0.0] * channels
+            for name in ("key", "special", "hit", "win"):
+                self.get(name)
+        except Exception:
+            self.enabled = False
+
+    def envelope(self, t, attack, decay):
+        return np.minimum(1.0, t / attack) * np.exp(-t / decay)
+
+    def tone(self, frequency, duration, attack=0.004, decay=0.05, harmonics=((1, 1.0), (2, 0.3), (3, 0.1))):
+        t = np.arange(int(duration * self.sample_rate)) / self.sample_rate
+        ratios = np.array([ratio for ratio, _ in harmonics])[:, None]
+        amps = np.array([amp for _, amp in harmonics])[:, None]
+        wave = (amps * np.sin(2 * np.pi * frequency * ratios * t)).sum(axis=0) / amps.sum()
+        return wave * self.envelope(t, attack, decay)
+
+    def synthesize(self, name):
+        if isinstance(name, tuple):
+            label = name[1]
+            idx = self.NOTE_NAMES.find(label[:1].upper()) if len(label) == 1 else -1
+            if idx < 0:
+                return self.synthesize("special")
+            octave, step = divmod(idx, len(self.PENTATONIC))
+            semitone = self.PENTATONIC[step] + 12 * (octave % 3)
+            return self.tone(523.25 * 2 ** (semitone / 12.0), 0.09)
+        if name == "key":
+            return self.tone(800.0, 0.1, decay=0.06)
+        if name == "special":
+            return np.concatenate([self.tone(440.0, 0.06), self.tone(330.0, 0.08)])
+        if name == "hit":
+            t = np.arange(int(0.12 * self.sample_rate)) / self.sample_rate
+            sweep = np.sin(2 * np.pi * (900.0 * t - 2500.0 * t * t))
+            noise = np.random.default_rng(7).uniform(-1.0, 1.0, t.size) * np.exp(-t / 0.01)
+            return (0.8 * sweep + 0.4 * noise) * self.envelope(t, 0.002, 0.04)
+        if name == "win":
+            notes = [523.25, 659.25, 783.99, 1046.5]
+            parts = [self.tone(freq, 0.14, decay=0.12) for freq in notes[:-1]]
+            parts.append(self.tone(notes[-1], 0.6, decay=0.35))
+            return np.concatenate(parts)
+        return None
+
+    def get(self, name):
+        if name in self.sounds:
+            return self.sounds[name]
+        wave = self.synthesize(name)
+        sound = None
+        if wave is not None:
+            samples = np.clip(wave * 32767, -32768, 32767).astype(np.int16)
+            if self.output_channels > 1:
+                samples = np.repeat(samples[:, None], self.output_channels, axis=1)
+            sound = pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+            sound.set_volume(self.volume)
+        self.sounds[name] = sound
+        return sound
+
+    def play(self, name):
+        if not self.enabled:
+            return None
+        try:
+            sound = self.get(name)
+            if sound is None:
+                return None
+            idx = next((i for i, channel in enumerate(self.channels) if not channel.get_busy()), None)
+            if idx is None:
+                idx = min(range(len(self.channels)), key=self.started.__getitem__)
+            self.channels[idx].play(sound)
+            self.started[idx] = time.perf_counter()
+            return idx
+        except Exception:
+            return None
+
+    def play_key(self, key=None):
+        if key is None:
+            return self.play("key")
+        return self.play(("key", key))
+
+
+class WordPredictor:
+    """Prefix trie over a rank-ordered word list (or "word count" lines), flattened into arrays for fast lookups."""
+
+    def __init__(self, path, k=3, max_words=None):
+        self.path = path
+        self.k = k
+        self.max_words = max_words
+        self.words = []
+        self.edge_start = array("i")
+        self.edge_chars = ""
+        self.edge_target = array("i")
+        self.top = array("i")
+        self.ready = False
+        self.failed = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last = ("", 0)
+
+    def load_async(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.load, daemon=True)
+                self._thread.start()
+
+    def load(self):
+        entries = []
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                for rank, line in enumerate(fh):
+                    parts = line.split()
+                    if not parts or not parts[0].isalpha():
+                        continue
+                    count = float(parts[1]) if len(parts) > 1 else -rank
+                    entries.append((count, parts[0].lower()))
+        except (OSError, ValueError):
+            self.failed = True
+            return
+        entries.sort(key=lambda entry: -entry[0])
+        seen = set()
+        words = []
+        for _, word in entries:
+            if word not in seen:
+                seen.add(word)
+                words.append(word)
+        self.build(words[:self.max_words] if self.max_words else words)
+
+    def build(self, words):
+        k = self.k
+        children = [{}]
+        tops = [[]]
+        for word_id, word in enumerate(words):
+            node = 0
+            for ch in word:
+                if len(tops[node]) < k:
+                    tops[node].append(word_id)
+                nxt = children[node].get(ch)
+                if nxt is None:
+                    nxt = len(children)
+                    children[node][ch] = nxt
+                    children.append({})
+                    tops.append([])
+                node = nxt
+            if len(tops[node]) < k:
+                tops[node].append(word_id)
+        edge_start = array("i")
+        edge_chars = []
+        edge_target = array("i")
+        top = array("i", [-1]) * (len(children) * k)
+        for node, kids in enumerate(children):
+            edge_start.append(len(edge_chars))
+            for ch in sorted(kids):
+                edge_chars.append(ch)
+                edge_target.append(kids[ch])
+            top[node * k:node * k + len(tops[node])] = array("i", tops[node])
+        edge_start.append(len(edge_chars))
+        self.words = words
+        self.edge_start = edge_start
+        self.edge_chars = "".join(edge_chars)
+        self.edge_target = edge_target
+        self.top = top
+        self._last = ("", 0)
+        self.ready = True
+
+    def _walk(self, prefix):
+        last_prefix, node = self._last
+        if not prefix.startswith(last_prefix):
+            last_prefix, node = "", 0
+        for ch in prefix[len(last_prefix):]:
+            idx = self.edge_chars.find(ch, self.edge_start[node], self.edge_start[node + 1])
+            if idx < 0:
+                return -1
+            node = self.edge_target[idx]
+        self._last = (prefix, node)
+        return node
+
+    def suggest(self, prefix):
+        if not self.ready:
+            if not self.failed:
+                self.load_async()
+            return []
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        node = self._walk(prefix)
+        if node < 0:
+            return []
+        return [self.words[word_id] for word_id in self.top[node * self.k:(node + 1) * self.k] if word_id >= 0]
+
+
+class VirtualKeyboard:
+    def __init__(self, source=None, sink=None, target_fps=60):
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_face_mesh = mp.solutions.face_mesh
@@ -24,9 +1855,23 @@ class VirtualKeyboard:
         self.hands = self.mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7, max_num_hands=2)
         self.face_mesh = self.mp_face_mesh.FaceMesh(max_num_faces=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
         self.pose = self.mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
+        self.source = source if source is not None else WebcamSource(0, 1920, 1080)
+        self.sink = sink if sink is not None else WindowSink("Virtual Keyboard")
+        self.capture_slots = 3
+        self.capture_drop_policy = "oldest"
+        self.capture = CameraCapture(self.source, slots=self.capture_slots, drop_policy=self.capture_drop_policy,
+                                     threaded=self.source.live and platform.system() != "Emscripten")
+        self.inference_size = (640, 360)
+        self.inference = InferenceExecutor(max_workers=1 if platform.system() == "Emscripten" else 3)
+        self.frame_id = 0
+        self.target_fps = target_fps
+        self.pacer = FramePacer(self.target_fps)
+        self.profiler = Profiler(enabled=False)
+        self.finger_filter = HandPointFilter()
+        self.show_perf_hud = False
+        self.hud_stages = ["capture", "convert", "inference", "overlay", "composite", "display", "pace"]
+        self.face_roi = RoiTracker(margin=0.6, min_size=0.3)
+        self.pose_roi = RoiTracker(margin=0.25, min_size=0.5)
         self.layouts = {
             "QWERTY": [
                 ["Q", "W", "E", "R", "T", "Y", "U", "I", "O", "P"],
@@ -90,14 +1935,33 @@ class VirtualKeyboard:
         self.key_width = 70
         self.key_height = 70
         self.key_start_x = 50
-        self.key_start_y = 50
+        self.key_start_y = 110
         self.spacing = 10
         self.scale_factor = 1.0
         self.key_animations = {}
+        self.keyboard_layer = None
+        self.key_geometry = None
+        self.key_geometry_signature = None
+        self.key_label_layouts = {}
+        self.text_cache = TextCache()
+        self.compositor = DamageCompositor()
+        self.keyboard_damage = []
+        self.hovered_keys = {}
+        self.hovered_suggestions = set()
+        self.word_predictors = {
+            "en": WordPredictor(os.path.join(os.getcwd(), "words_en.txt")),
+            "id": WordPredictor(os.path.join(os.getcwd(), "words_id.txt"))
+        }
+        self.layout_languages = {"QWERTY": "en", "AZERTY": "en", "INDONESIA": "id"}
+        self.suggestions = []
+        self.suggestion_signature = None
+        self.suggestion_height = 50
         self.animation_duration = 0.3
         self.typed_text = ""
-        self.pressed_time = {"left": 0, "right": 0}
-        self.last_pressed = {"left": "", "right": ""}
+        self.press_detectors = [detector() for detector in PRESS_DETECTORS]
+        self.press_mode = 0
+        self.press_detector = self.press_detectors[self.press_mode]
+        self.landmark_recorder = None
         self.show_keyboard = False
         self.show_threshold = 120
         self.hide_threshold = 100
@@ -106,17 +1970,9 @@ class VirtualKeyboard:
         self.follow_hand = False
         self.game_mode = False
         self.current_game = None
-        self.games = {
-            "pong": PongGame(),
-            "brick": BrickBreakerGame(),
-            "catch": CatchGame(),
-            "snake": SnakeGame(),
-            "mole": WhackAMoleGame(),
-            "balloon": BalloonPopGame(),
-            "flappy": FlappyBirdGame(),
-            "dodge": DodgeGame(),
-            "shooter": SpaceShooterGame()
-        }
+        self.games = {name: game_class() for name, game_class in GAME_CLASSES.items()}
+        for game in self.games.values():
+            game.use_text_cache(self.text_cache)
         self.draw_mode = False
         self.drawing_canvas = None
         self.current_color = (255, 255, 255)
@@ -130,7 +1986,10 @@ class VirtualKeyboard:
             (0, 255, 255)
         ]
         self.brush_size = 5
-        self.last_point = None
+        self.drawing = None
+        self.drawing_status = ""
+        self.draw_button_timers = {}
+        self.draw_panel = (200, 100, 600, 400)
         self.hand_landmarks = None
         self.meme_mode = False
         self.meme_paths = {
@@ -139,13 +1998,11 @@ class VirtualKeyboard:
             "THINKING": "thinking.jpg",
             "NEUTRAL": "neutral.jpg"
         }
-        self.meme_images = {}
+        self.meme_assets = MemeAssetCache(self.meme_paths)
         self.meme_current = "NEUTRAL"
         self.meme_pending = "NEUTRAL"
         self.meme_last_change = time.time()
         self.meme_hold_seconds = 0.25
-        self.meme_image_height = None
-        self.meme_image_max_width = None
         self.meme_width_fraction = 0.35
         self.pushup_mode = False
         self.pushup_count = 0
@@ -161,36 +2018,20 @@ class VirtualKeyboard:
         self.photo_cooldown = 4
         self.photo_status = "Pinch jempol + telunjuk untuk foto"
         self.photo_save_dir = os.path.join(os.getcwd(), "captures")
-        self.shortcut_last_touch = {"meme": 0, "pushup": 0, "photo": 0}
-        self.create_sound_effects()
+        self.photo_writer = PhotoWriter()
+        self.photo_burst = 1
+        self.photo_burst_window = 0.5
+        self.photo_burst_before = collections.deque()
+        self.photo_burst_after = []
+        self.recorder = VideoRecorder(os.path.join(os.getcwd(), "recordings"))
+        self.record_raw = False
+        self.record_status = ""
+        self.shortcut_last_touch = {"meme": 0, "pushup": 0, "photo": 0, "record": 0}
+        self.sounds = SoundBank()
+        self.game_sound_state = None
 
-    def create_sound_effects(self):
-        if not MIXER_READY:
-            self.key_sound = None
-            return
-        try:
-            sample_rate = 22050
-            duration = 0.1
-            frequency = 800
-            frames = int(duration * sample_rate)
-            arr = np.zeros(frames)
-            for i in range(frames):
-                arr[i] = np.sin(2 * np.pi * frequency * i / sample_rate)
-            arr = (arr * 32767).astype(np.int16)
-            stereo_arr = np.zeros((frames, 2), dtype=np.int16)
-            stereo_arr[:, 0] = arr
-            stereo_arr[:, 1] = arr
-            self.key_sound = pygame.sndarray.make_sound(stereo_arr)
-            self.key_sound.set_volume(0.3)
-        except Exception:
-            self.key_sound = None
-
-    def play_key_sound(self):
-        if self.key_sound:
-            try:
-                self.key_sound.play()
-            except:
-                pass
+    def play_key_sound(self, key=None):
+        self.sounds.play_key(key)
 
     def get_current_theme(self):
         return self.themes[self.current_theme]
@@ -226,11 +2067,12 @@ class VirtualKeyboard:
         self.pushup_mode = False
         self.photo_mode = False
         if self.draw_mode:
-            h, w = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            self.drawing_canvas = np.zeros((h, w, 3), dtype=np.uint8)
-            self.last_point = None
+            self.drawing_canvas = DrawingCanvas()
+            self.drawing = StrokeDrawing()
+            self.drawing_status = ""
         else:
             self.drawing_canvas = None
+            self.drawing = None
 
     def toggle_meme_mode(self):
         self.meme_mode = not self.meme_mode
@@ -326,12 +2168,32 @@ class VirtualKeyboard:
         elif key == "Photo":
             self.toggle_photo_mode()
 
+    def damage_landmarks(self, landmark_list, frame_width, frame_height, margin):
+        if landmark_list is None:
+            return
+        points = [(lm.x * frame_width, lm.y * frame_height) for lm in landmark_list.landmark]
+        self.compositor.damage_points(points, margin)
+
     def get_text_size(self, text, font=cv2.FONT_HERSHEY_SIMPLEX, font_scale=1, thickness=2):
-        return cv2.getTextSize(text, font, font_scale, thickness)[0]
+        return self.text_cache.measure(text, font, font_scale, thickness)[0]
+
+    def put_text(self, img, text, org, font_scale, color, thickness=1, line_type=cv2.LINE_8):
+        return self.text_cache.put(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness, line_type)
 
     def calculate_distance(self, point1, point2):
         return np.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
 
+    def get_inference_frame(self, frame):
+        if not self.inference_size:
+            return frame
+        h, w = frame.shape[:2]
+        max_w, max_h = self.inference_size
+        scale = min(max_w / w, max_h / h)
+        if scale >= 1.0:
+            return frame
+        size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
     def calculate_joint_angle(self, a, b, c):
         a = np.array(a, dtype=np.float32)
         b = np.array(b, dtype=np.float32)
@@ -342,27 +2204,6 @@ class VirtualKeyboard:
         cos_angle = np.clip(np.dot(ba, bc) / denom, -1.0, 1.0)
         return float(np.degrees(np.arccos(cos_angle)))
 
-    def load_meme_images(self, target_height, max_width):
-        self.meme_images = {}
-        self.meme_image_height = target_height
-        self.meme_image_max_width = max_width
-        for gesture, filename in self.meme_paths.items():
-            path = os.path.join(os.getcwd(), filename)
-            img = cv2.imread(path)
-            if img is None:
-                continue
-            ratio_h = target_height / img.shape[0]
-            ratio_w = max_width / img.shape[1] if max_width else ratio_h
-            scale = min(ratio_h, ratio_w)
-            width = max(1, int(img.shape[1] * scale))
-            height = max(1, int(img.shape[0] * scale))
-            resized = cv2.resize(img, (width, height))
-            if height != target_height:
-                pad_top = max(0, (target_height - height) // 2)
-                pad_bottom = max(0, target_height - height - pad_top)
-                resized = cv2.copyMakeBorder(resized, pad_top, pad_bottom, 0, 0, cv2.BORDER_CONSTANT, value=(0, 0, 0))
-            self.meme_images[gesture] = resized
-
     def classify_meme_gesture(self, hand_landmarks):
         y_thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP].y
         y_index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
@@ -420,13 +2261,11 @@ class VirtualKeyboard:
             self.meme_pending = self.meme_current
             self.meme_last_change = now
 
+    def get_meme_strip_width(self, frame_width):
+        return min(frame_width, max(80, int(frame_width * self.meme_width_fraction)))
+
     def get_meme_image(self, target_height, frame_width):
-        max_width = int(frame_width * self.meme_width_fraction)
-        if (not self.meme_images or
-                self.meme_image_height != target_height or
-                self.meme_image_max_width != max_width):
-            self.load_meme_images(target_height, max_width)
-        return self.meme_images.get(self.meme_current)
+        return self.meme_assets.get(self.meme_current, self.get_meme_strip_width(frame_width), target_height)
 
     def update_pushup_counter(self, overlay, pose_landmarks, frame_width, frame_height):
         theme = self.get_current_theme()
@@ -435,7 +2274,9 @@ class VirtualKeyboard:
         angle = None
         progress = 0.0
         draw_points = None
+        self.compositor.damage(panel_x - 2, panel_y - 2, panel_x + panel_w + 3, panel_y + panel_h + 3)
         if pose_landmarks:
+            self.damage_landmarks(pose_landmarks, frame_width, frame_height, 16)
             self.mp_drawing.draw_landmarks(overlay, pose_landmarks, self.mp_pose.POSE_CONNECTIONS)
             angles = []
             for side in ("LEFT", "RIGHT"):
@@ -497,12 +2338,12 @@ class VirtualKeyboard:
             cv2.circle(overlay, w, 8, (255, 255, 255), -1)
         cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_w, panel_y + panel_h), theme["bg_color"], -1)
         cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_w, panel_y + panel_h), theme["border_color"], 2)
-        cv2.putText(overlay, "Push-up Counter", (panel_x + 10, panel_y + 24), cv2.FONT_HERSHEY_SIMPLEX, 0.7, theme["text_active"], 2)
-        cv2.putText(overlay, f"Hitungan: {self.pushup_count}", (panel_x + 10, panel_y + 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, theme["text_color"], 2)
+        self.put_text(overlay, "Push-up Counter", (panel_x + 10, panel_y + 24), 0.7, theme["text_active"], 2)
+        self.put_text(overlay, f"Hitungan: {self.pushup_count}", (panel_x + 10, panel_y + 50), 0.7, theme["text_color"], 2)
         if angle is not None:
-            cv2.putText(overlay, f"Sudut siku: {int(angle)} deg", (panel_x + 10, panel_y + 75), cv2.FONT_HERSHEY_SIMPLEX, 0.6, theme["text_color"], 2)
+            self.put_text(overlay, f"Sudut siku: {int(angle)} deg", (panel_x + 10, panel_y + 75), 0.6, theme["text_color"], 2)
         else:
-            cv2.putText(overlay, "Sudut siku belum terbaca", (panel_x + 10, panel_y + 75), cv2.FONT_HERSHEY_SIMPLEX, 0.6, theme["text_color"], 2)
+            self.put_text(overlay, "Sudut siku belum terbaca", (panel_x + 10, panel_y + 75), 0.6, theme["text_color"], 2)
         bar_start = (panel_x + 10, panel_y + 90)
         bar_end = (panel_x + panel_w - 10, panel_y + 110)
         cv2.rectangle(overlay, bar_start, bar_end, theme["border_color"], 2)
@@ -511,7 +2352,7 @@ class VirtualKeyboard:
         bar_color = (0, 220, 100) if self.pushup_stage == "up" else (255, 180, 60)
         cv2.rectangle(overlay, (bar_start[0] + 1, bar_start[1] + 1), (bar_start[0] + 1 + fill_w, bar_end[1] - 1), bar_color, -1)
         feedback_text = self.pushup_feedback[:42] if len(self.pushup_feedback) > 42 else self.pushup_feedback
-        cv2.putText(overlay, feedback_text, (panel_x + 10, panel_y + panel_h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, theme["text_active"], 2)
+        self.put_text(overlay, feedback_text, (panel_x + 10, panel_y + panel_h - 10), 0.6, theme["text_active"], 2)
         if self.pushup_last_rep_time:
             tempo = time.time() - self.pushup_last_rep_time
             cv2.putText(overlay, f"Tempo terakhir: {tempo:.1f}s", (panel_x + 10, panel_y + 125), cv2.FONT_HERSHEY_SIMPLEX, 0.5, theme["text_color"], 1)
@@ -520,17 +2361,26 @@ class VirtualKeyboard:
     def start_photo_countdown(self):
         self.photo_pending = True
         self.photo_capture_time = time.time() + self.photo_countdown_seconds
+        self.photo_burst_before.clear()
+        self.photo_burst_after = []
         self.photo_status = f"Foto dalam {self.photo_countdown_seconds} dtk..."
 
-    def save_photo(self, frame):
-        try:
-            os.makedirs(self.photo_save_dir, exist_ok=True)
-            filename = f"photo_{time.strftime('%Y%m%d_%H%M%S')}.png"
-            path = os.path.join(self.photo_save_dir, filename)
-            cv2.imwrite(path, frame)
-            return path
-        except Exception:
-            return None
+    def save_photo(self, frames):
+        basename = f"photo_{time.strftime('%Y%m%d_%H%M%S')}"
+        if self.photo_writer.submit(frames, self.photo_save_dir, basename):
+            self.photo_status = "Menyimpan foto..."
+            return basename
+        self.photo_status = "Antrian penuh, foto dilewati"
+        return None
+
+    def poll_photo_writer(self):
+        for basename, paths, error in self.photo_writer.poll():
+            if error is not None or not paths:
+                self.photo_status = "Gagal simpan foto"
+            elif len(paths) > 1:
+                self.photo_status = f"Tersimpan: {basename} ({len(paths)} foto)"
+            else:
+                self.photo_status = f"Tersimpan: {os.path.basename(paths[0])}"
 
     def draw_photo_countdown(self, overlay, remaining):
         theme = self.get_current_theme()
@@ -539,8 +2389,8 @@ class VirtualKeyboard:
         seconds_left = max(1, math.ceil(remaining))
         cv2.circle(overlay, center, radius, theme["border_color"], 6)
         cv2.circle(overlay, center, max(10, int(radius * (remaining / max(self.photo_countdown_seconds, 1)))), theme["key_hover"], 2)
-        cv2.putText(overlay, str(seconds_left), (center[0] - 35, center[1] + 20), cv2.FONT_HERSHEY_SIMPLEX, 2.5, theme["text_active"], 6)
-        cv2.putText(overlay, "Jaga pose", (center[0] - 80, center[1] + 80), cv2.FONT_HERSHEY_SIMPLEX, 0.8, theme["text_color"], 2)
+        self.put_text(overlay, str(seconds_left), (center[0] - 35, center[1] + 20), 2.5, theme["text_active"], 6)
+        self.put_text(overlay, "Jaga pose", (center[0] - 80, center[1] + 80), 0.8, theme["text_color"], 2)
         return overlay
 
     def draw_photo_panel(self, overlay):
@@ -551,12 +2401,13 @@ class VirtualKeyboard:
         y = margin
         cv2.rectangle(overlay, (x, y), (x + panel_w, y + panel_h), theme["bg_color"], -1)
         cv2.rectangle(overlay, (x, y), (x + panel_w, y + panel_h), theme["border_color"], 2)
-        cv2.putText(overlay, "PHOTO MODE", (x + 10, y + 28), cv2.FONT_HERSHEY_SIMPLEX, 0.7, theme["text_active"], 2)
-        cv2.putText(overlay, self.photo_status[:32], (x + 10, y + 54), cv2.FONT_HERSHEY_SIMPLEX, 0.6, theme["text_color"], 2)
-        cv2.putText(overlay, "Pinch jempol+telunjuk", (x + 10, y + 78), cv2.FONT_HERSHEY_SIMPLEX, 0.5, theme["text_color"], 1)
+        self.put_text(overlay, "PHOTO MODE", (x + 10, y + 28), 0.7, theme["text_active"], 2)
+        self.put_text(overlay, self.photo_status[:32], (x + 10, y + 54), 0.6, theme["text_color"], 2)
+        self.put_text(overlay, "Pinch jempol+telunjuk", (x + 10, y + 78), 0.5, theme["text_color"], 1)
         return overlay
 
     def handle_photo_mode(self, display_frame, base_frame, pinch_triggered):
+        self.poll_photo_writer()
         if not self.photo_mode:
             return display_frame
         now = time.time()
@@ -565,20 +2416,44 @@ class VirtualKeyboard:
         remaining = None
         if self.photo_pending:
             remaining = self.photo_capture_time - now
-            if remaining <= 0:
-                frame_to_save = base_frame.copy()
-                saved_path = self.save_photo(frame_to_save)
-                self.photo_pending = False
-                self.photo_last_saved = now
-                if saved_path:
-                    self.photo_status = f"Tersimpan: {os.path.basename(saved_path)}"
-                else:
-                    self.photo_status = "Gagal simpan foto"
+            before = self.photo_burst // 2
+            if remaining > 0:
+                if before and remaining <= self.photo_burst_window:
+                    if len(self.photo_burst_before) >= before:
+                        self.photo_burst_before.popleft()
+                    self.photo_burst_before.append(base_frame.copy())
+            else:
+                self.photo_burst_after.append(base_frame.copy())
+                if len(self.photo_burst_after) >= self.photo_burst - len(self.photo_burst_before):
+                    self.save_photo(list(self.photo_burst_before) + self.photo_burst_after)
+                    self.photo_burst_before.clear()
+                    self.photo_burst_after = []
+                    self.photo_pending = False
+                    self.photo_last_saved = now
         if remaining is not None and remaining > 0:
             display_frame = self.draw_photo_countdown(display_frame, remaining)
         display_frame = self.draw_photo_panel(display_frame)
         return display_frame
 
+    def toggle_recording(self):
+        if self.recorder.recording:
+            path = self.recorder.stop()
+            self.record_status = f"Rekaman: {os.path.basename(path)} (drop {self.recorder.dropped})"
+        else:
+            self.recorder.start()
+            self.record_status = ""
+
+    def draw_recording_indicator(self, overlay):
+        theme = self.get_current_theme()
+        x = overlay.shape[1] - 250
+        if self.recorder.recording:
+            elapsed = int(time.time() - self.recorder.started_at)
+            cv2.circle(overlay, (x, 22), 8, (0, 0, 255), -1)
+            self.put_text(overlay, f"REC {elapsed // 60:02d}:{elapsed % 60:02d}  drop {self.recorder.dropped}",
+                          (x + 16, 28), 0.6, theme["text_color"], 2)
+        elif self.record_status:
+            self.put_text(overlay, self.record_status[:40], (x - 150, 28), 0.5, theme["text_color"], 1)
+
     def draw_quick_shortcuts(self, overlay, finger_pos):
         theme = self.get_current_theme()
         btn_w, btn_h = 110, 60
@@ -588,8 +2463,10 @@ class VirtualKeyboard:
         buttons = [
             {"id": "meme", "label": "Meme", "active": self.meme_mode, "action": self.toggle_meme_mode},
             {"id": "pushup", "label": "Pushup", "active": self.pushup_mode, "action": self.toggle_pushup_mode},
-            {"id": "photo", "label": "Foto", "active": self.photo_mode, "action": self.toggle_photo_mode}
+            {"id": "photo", "label": "Foto", "active": self.photo_mode, "action": self.toggle_photo_mode},
+            {"id": "record", "label": "Rekam", "active": self.recorder.recording, "action": self.toggle_recording}
         ]
+        self.compositor.damage(start_x - 2, start_y - 2, start_x + len(buttons) * (btn_w + margin) + 2, start_y + btn_h + 3)
         for idx, btn in enumerate(buttons):
             x = start_x + idx * (btn_w + margin)
             y = start_y
@@ -602,7 +2479,7 @@ class VirtualKeyboard:
             text_size = self.get_text_size(btn["label"], font_scale=0.8)
             text_x = x + (btn_w - text_size[0]) // 2
             text_y = y + (btn_h + text_size[1]) // 2
-            cv2.putText(overlay, btn["label"], (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, theme["text_color"], 2)
+            self.put_text(overlay, btn["label"], (text_x, text_y), 0.8, theme["text_color"], 2)
             if is_touching:
                 now = time.time()
                 last = self.shortcut_last_touch.get(btn["id"], 0)
@@ -611,6 +2488,18 @@ class VirtualKeyboard:
                     self.shortcut_last_touch[btn["id"]] = now
         return overlay
 
+    def play_game_sounds(self, name, game):
+        score = getattr(game, "score", None)
+        win = getattr(game, "win", False)
+        previous = self.game_sound_state
+        self.game_sound_state = (name, score, win)
+        if previous is None or previous[0] != name:
+            return
+        if win and not previous[2]:
+            self.sounds.play("win")
+        elif score is not None and previous[1] is not None and score > previous[1]:
+            self.sounds.play("hit")
+
     def get_game_score(self):
         if not self.game_mode or self.current_game in (None, "menu"):
             return None
@@ -637,6 +2526,7 @@ class VirtualKeyboard:
         theme = self.get_current_theme()
         button_x, button_y = game_area[2] - 100, game_area[1] + 10
         button_width, button_height = 80, 40
+        self.compositor.damage(button_x - 2, button_y - 2, button_x + button_width + 3, button_y + button_height + 3)
         is_touching = finger_pos and self.is_finger_touching(finger_pos[0], finger_pos[1], button_x, button_y, button_width, button_height)
         btn_color = theme["key_hover"] if is_touching else theme["key_color"]
         cv2.rectangle(overlay, (button_x, button_y), (button_x + button_width, button_y + button_height), btn_color, -1)
@@ -644,7 +2534,7 @@ class VirtualKeyboard:
         text_size = self.get_text_size("Finish", font_scale=0.5)
         text_x = button_x + (button_width - text_size[0]) // 2
         text_y = button_y + (button_height + text_size[1]) // 2
-        cv2.putText(overlay, "Finish", (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, theme["text_color"], 2)
+        self.put_text(overlay, "Finish", (text_x, text_y), 0.5, theme["text_color"], 2)
         if is_touching and hasattr(self, 'finish_button_timer'):
             if time.time() - self.finish_button_timer > 1.0:
                 self.current_game = "menu"
@@ -653,15 +2543,23 @@ class VirtualKeyboard:
             self.finish_button_timer = time.time()
         return overlay
 
+    def damage_game(self, game):
+        if game.win:
+            self.compositor.damage_all()
+            return
+        left, top, right, bottom = game.game_area
+        self.compositor.damage(0, top - 45, self.compositor.shape[1], bottom + 45)
+
     def draw_game_menu(self, overlay, finger_pos=None):
         theme = self.get_current_theme()
         menu_x, menu_y, menu_width, menu_height = 200, 100, 600, 400
+        self.compositor.damage(menu_x - 2, menu_y - 2, menu_x + menu_width + 3, menu_y + menu_height + 3)
         cv2.rectangle(overlay, (menu_x, menu_y), (menu_x + menu_width, menu_y + menu_height), theme["bg_color"], -1)
         cv2.rectangle(overlay, (menu_x, menu_y), (menu_x + menu_width, menu_y + menu_height), theme["border_color"], 3)
         title = "MINI GAMES"
         title_size = self.get_text_size(title, font_scale=1.2, thickness=3)
         title_x = menu_x + (menu_width - title_size[0]) // 2
-        cv2.putText(overlay, title, (title_x, menu_y + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, theme["text_active"], 3)
+        self.put_text(overlay, title, (title_x, menu_y + 50), 1.2, theme["text_active"], 3)
         games_list = [
             ("Pong", "pong"),
             ("Brick Breaker", "brick"),
@@ -690,7 +2588,7 @@ class VirtualKeyboard:
             text_size = self.get_text_size(name, font_scale=0.5)
             text_x = btn_x + (button_width - text_size[0]) // 2
             text_y = btn_y + (button_height + text_size[1]) // 2
-            cv2.putText(overlay, name, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, theme["text_color"], 2)
+            self.put_text(overlay, name, (text_x, text_y), 0.5, theme["text_color"], 2)
             if is_touching and hasattr(self, 'game_selection_timer'):
                 if time.time() - self.game_selection_timer > 1.0:
                     if game_id == "back":
@@ -706,7 +2604,8 @@ class VirtualKeyboard:
 
     def draw_color_picker(self, overlay, finger_pos):
         theme = self.get_current_theme()
-        draw_area = (200, 100, 600, 400)
+        draw_area = self.draw_panel
+        self.compositor.damage(draw_area[0] - 2, draw_area[1] - 2, draw_area[2] + 3, draw_area[3] + 3)
         button_width, button_height = 50, 50
         start_x = draw_area[0] + 50
         start_y = draw_area[1] + 100
@@ -732,7 +2631,7 @@ class VirtualKeyboard:
         text_size = self.get_text_size("Exit", font_scale=0.5)
         text_x = exit_x + (80 - text_size[0]) // 2
         text_y = exit_y + (40 + text_size[1]) // 2
-        cv2.putText(overlay, "Exit", (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, theme["text_color"], 2)
+        self.put_text(overlay, "Exit", (text_x, text_y), 0.5, theme["text_color"], 2)
         if is_touching_exit and hasattr(self, 'exit_button_timer'):
             if time.time() - self.exit_button_timer > 1.0:
                 self.toggle_draw_mode()
@@ -741,86 +2640,304 @@ class VirtualKeyboard:
             self.exit_button_timer = time.time()
         cv2.rectangle(overlay, (draw_area[0] + 50, draw_area[1] + 50), (draw_area[0] + 100, draw_area[1] + 80), self.current_color, -1)
         cv2.rectangle(overlay, (draw_area[0] + 50, draw_area[1] + 50), (draw_area[0] + 100, draw_area[1] + 80), theme["border_color"], 2)
+        actions = [("undo", "Undo", self.undo_drawing), ("redo", "Redo", self.redo_drawing), ("save", "Simpan", self.export_drawing)]
+        for idx, (btn_id, label, action) in enumerate(actions):
+            btn_x = draw_area[0] + 50 + idx * 95
+            btn_y = draw_area[1] + 235
+            is_touching = finger_pos and self.is_finger_touching(finger_pos[0], finger_pos[1], btn_x, btn_y, 85, 40)
+            btn_color = theme["key_hover"] if is_touching else theme["key_color"]
+            cv2.rectangle(overlay, (btn_x, btn_y), (btn_x + 85, btn_y + 40), btn_color, -1)
+            cv2.rectangle(overlay, (btn_x, btn_y), (btn_x + 85, btn_y + 40), theme["border_color"], 2)
+            text_size = self.get_text_size(label, font_scale=0.5)
+            self.put_text(overlay, label, (btn_x + (85 - text_size[0]) // 2, btn_y + (40 + text_size[1]) // 2), 0.5, theme["text_color"], 2)
+            if not is_touching:
+                self.draw_button_timers.pop(btn_id, None)
+            elif btn_id not in self.draw_button_timers:
+                self.draw_button_timers[btn_id] = time.time()
+            elif time.time() - self.draw_button_timers[btn_id] > 1.0:
+                action()
+                self.draw_button_timers[btn_id] = float("inf")
+        if self.drawing_status:
+            self.put_text(overlay, self.drawing_status[:40], (draw_area[0] + 50, draw_area[1] + 290), 0.5, theme["text_color"], 1)
+        return overlay
+
+    def get_key_geometry(self, hand_center=None):
+        center = tuple(hand_center) if self.follow_hand and hand_center else None
+        signature = (self.current_layout, self.key_start_x + self.keyboard_offset_x, self.key_start_y + self.keyboard_offset_y,
+                     self.key_width, self.key_height, self.spacing, center)
+        if self.key_geometry is None or self.key_geometry_signature != signature:
+            self.key_geometry = KeyGeometry(self.layouts[self.current_layout], signature[1], signature[2],
+                                            self.key_width, self.key_height, self.spacing, center)
+            self.key_geometry_signature = signature
+        return self.key_geometry
+
+    def get_key_label_layout(self, key):
+        cache_key = (key, self.scale_factor, self.key_width, self.key_height)
+        layout = self.key_label_layouts.get(cache_key)
+        if layout is None:
+            font_scale = 0.6 * self.scale_factor
+            text_width, text_height = self.get_text_size(key, font_scale=font_scale)
+            if text_width > self.key_width - 10:
+                font_scale = 0.4 * self.scale_factor
+                text_width, text_height = self.get_text_size(key, font_scale=font_scale)
+            layout = (font_scale, (self.key_width - text_width) // 2, (self.key_height + text_height) // 2)
+            self.key_label_layouts[cache_key] = layout
+        return layout
+
+    def get_key_style(self, key, theme):
+        if key in self.key_animations:
+            pulse = self.key_animations[key]['pulse']
+            return tuple(int(c + (255 - c) * pulse * 0.5) for c in theme["key_pressed"]), theme["text_active"]
+        return theme["key_color"], theme["text_color"]
+
+    def draw_key(self, img, key, x, y, fill, text_color, border_color, glow_color=None):
+        cv2.rectangle(img, (x, y), (x + self.key_width, y + self.key_height), fill, -1)
+        cv2.rectangle(img, (x, y), (x + self.key_width, y + self.key_height), border_color, 2)
+        if glow_color is not None:
+            gx0, gy0 = max(0, x - 2), max(0, y - 2)
+            gx1 = min(img.shape[1], x + self.key_width + 3)
+            gy1 = min(img.shape[0], y + self.key_height + 3)
+            if gx1 > gx0 and gy1 > gy0:
+                region = img[gy0:gy1, gx0:gx1]
+                region[:] = cv2.addWeighted(region, 0.9, np.full_like(region, glow_color), 0.1, 0)
+        font_scale, text_dx, text_dy = self.get_key_label_layout(key)
+        if img.ndim == 3:
+            self.put_text(img, key, (x + text_dx, y + text_dy), font_scale, text_color, 2)
+        else:
+            cv2.putText(img, key, (x + text_dx, y + text_dy), cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, 2)
+
+    def get_glow_color(self, theme):
+        return theme["border_color"] if self.current_theme == "neon" else None
+
+    def paste_masked(self, dst, src, mask, x0, y0):
+        h, w = dst.shape[:2]
+        sh, sw = src.shape[:2]
+        dx0, dy0 = max(0, x0), max(0, y0)
+        dx1, dy1 = min(w, x0 + sw), min(h, y0 + sh)
+        if dx1 <= dx0 or dy1 <= dy0:
+            return None
+        sx0, sy0 = dx0 - x0, dy0 - y0
+        sx1, sy1 = sx0 + dx1 - dx0, sy0 + dy1 - dy0
+        np.copyto(dst[dy0:dy1, dx0:dx1], src[sy0:sy1, sx0:sx1], where=mask[sy0:sy1, sx0:sx1])
+        return (dx0, dy0, dx1, dy1), (sx0, sy0, sx1, sy1)
+
+    def draw_key_sprite(self, overlay, key, x, y, fill, text_color, theme):
+        pad = 2
+        size = (self.key_height + 2 * pad + 1, self.key_width + 2 * pad + 1)
+        sprite = np.zeros(size + (3,), dtype=np.uint8)
+        mask = np.zeros(size, dtype=np.uint8)
+        self.draw_key(sprite, key, pad, pad, fill, text_color, theme["border_color"], self.get_glow_color(theme))
+        self.draw_key(mask, key, pad, pad, 255, 255, 255)
+        self.paste_masked(overlay, sprite, mask.astype(bool)[..., None], x - pad, y - pad)
+
+    def get_keyboard_layer(self):
+        cache_key = (self.current_layout, self.current_theme, self.scale_factor, self.keyboard_offset_x, self.keyboard_offset_y)
+        if self.keyboard_layer is not None and self.keyboard_layer[0] == cache_key:
+            return self.keyboard_layer[1:]
+        theme = self.get_current_theme()
+        glow_color = self.get_glow_color(theme)
+        positions = self.get_key_geometry().positions
+        pad = 2
+        x0 = min(x for _, x, _ in positions) - pad
+        y0 = min(y for _, _, y in positions) - pad
+        x1 = max(x for _, x, _ in positions) + self.key_width + pad + 1
+        y1 = max(y for _, _, y in positions) + self.key_height + pad + 1
+        layer = np.zeros((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        halo = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for key, x, y in positions:
+            self.draw_key(layer, key, x - x0, y - y0, theme["key_color"], theme["text_color"], theme["border_color"], glow_color)
+            self.draw_key(mask, key, x - x0, y - y0, 255, 255, 255)
+            if glow_color is not None:
+                cv2.rectangle(halo, (x - x0 - 2, y - y0 - 2), (x - x0 + self.key_width + 2, y - y0 + self.key_height + 2), 255, -1)
+        mask = mask.astype(bool)
+        glow = None
+        if glow_color is not None:
+            halo_mask = (halo > 0) & ~mask
+            glow = (halo_mask[..., None], np.full(layer.shape, glow_color, dtype=np.uint8))
+        self.keyboard_layer = (cache_key, layer, mask[..., None], (x0, y0), glow)
+        return self.keyboard_layer[1:]
+
+    def blit_keyboard_layer(self, overlay):
+        layer, mask, (x0, y0), glow = self.get_keyboard_layer()
+        placed = self.paste_masked(overlay, layer, mask, x0, y0)
+        if placed is not None and glow is not None:
+            (dx0, dy0, dx1, dy1), (sx0, sy0, sx1, sy1) = placed
+            halo_mask, glow_patch = glow
+            region = overlay[dy0:dy1, dx0:dx1]
+            blended = cv2.addWeighted(region, 0.9, glow_patch[sy0:sy1, sx0:sx1], 0.1, 0)
+            np.copyto(region, blended, where=halo_mask[sy0:sy1, sx0:sx1])
         return overlay
 
-    def draw_keyboard(self, overlay, hand_center=None):
+    def damage_keyboard(self, hand_center=None):
+        rects = [self.get_key_geometry(hand_center).bounds]
+        lookup = self.get_key_geometry().lookup
+        keys = list(self.hovered_keys.values()) + [lookup[key] for key in self.key_animations if key in lookup]
+        rects.extend((x, y, x + self.key_width, y + self.key_height) for _, x, y in keys)
+        for x0, y0, x1, y1 in rects + self.keyboard_damage:
+            self.compositor.damage(x0 - 4, y0 - 4, x1 + 5, y1 + 5)
+        self.keyboard_damage = rects
+
+    def draw_keyboard(self, overlay, hand_center=None):
+        theme = self.get_current_theme()
+        self.damage_keyboard(hand_center)
+        if self.follow_hand and hand_center:
+            glow_color = self.get_glow_color(theme)
+            for key, x, y in self.get_key_geometry(hand_center).positions:
+                key_color, text_color = self.get_key_style(key, theme)
+                self.draw_key(overlay, key, x, y, key_color, text_color, theme["border_color"], glow_color)
+        else:
+            overlay = self.blit_keyboard_layer(overlay)
+            lookup = self.get_key_geometry().lookup
+            for key in self.key_animations:
+                if key in lookup:
+                    _, x, y = lookup[key]
+                    key_color, text_color = self.get_key_style(key, theme)
+                    self.draw_key_sprite(overlay, key, x, y, key_color, text_color, theme)
+        for key, x, y in self.hovered_keys.values():
+            self.draw_key_sprite(overlay, key, x, y, theme["key_hover"], (0, 0, 0), theme)
+        return self.draw_suggestions(overlay, hand_center)
+
+    def current_word(self):
+        if not self.typed_text or self.typed_text.endswith(" "):
+            return ""
+        return self.typed_text.rsplit(" ", 1)[-1]
+
+    def update_suggestions(self):
+        predictor = self.word_predictors[self.layout_languages.get(self.current_layout, "en")]
+        prefix = self.current_word()
+        signature = (predictor, prefix, predictor.ready)
+        if signature == self.suggestion_signature:
+            return self.suggestions
+        self.suggestion_signature = signature
+        self.suggestions = predictor.suggest(prefix) if prefix.isalpha() else []
+        return self.suggestions
+
+    def get_suggestion_slots(self, hand_center=None):
+        suggestions = self.update_suggestions()
+        if not suggestions:
+            return []
+        x0, y0, x1, _ = self.get_key_geometry(hand_center).bounds
+        count = len(suggestions)
+        slot_w = (x1 - x0 - (count - 1) * self.spacing) // count
+        slot_y = y0 - self.spacing - self.suggestion_height
+        return [(word, x0 + idx * (slot_w + self.spacing), slot_y, slot_w, self.suggestion_height)
+                for idx, word in enumerate(suggestions)]
+
+    def accept_suggestion(self, word):
+        partial = self.current_word()
+        if partial.isupper():
+            word = word.upper()
+        elif partial[:1].isupper():
+            word = word.capitalize()
+        self.typed_text = self.typed_text[:len(self.typed_text) - len(partial)] + word + " "
+
+    def draw_suggestions(self, overlay, hand_center=None):
         theme = self.get_current_theme()
-        keys = self.layouts[self.current_layout]
-        for row_idx, row in enumerate(keys):
-            for coll_idx, key in enumerate(row):
-                base_x = self.key_start_x + self.keyboard_offset_x + coll_idx * (self.key_width + self.spacing)
-                base_y = self.key_start_y + self.keyboard_offset_y + row_idx * (self.key_height + self.spacing)
-                x, y = self.get_curved_position(base_x, base_y, hand_center) if self.follow_hand and hand_center else (base_x, base_y)
-                key_color = theme["key_color"]
-                if key in self.key_animations:
-                    pulse = self.key_animations[key]['pulse']
-                    key_color = tuple(int(c + (255 - c) * pulse * 0.5) for c in theme["key_pressed"])
-                cv2.rectangle(overlay, (x, y), (x + self.key_width, y + self.key_height), key_color, -1)
-                cv2.rectangle(overlay, (x, y), (x + self.key_width, y + self.key_height), theme["border_color"], 2)
-                if self.current_theme == "neon":
-                    glow_overlay = overlay.copy()
-                    cv2.rectangle(glow_overlay, (x-2, y-2), (x + self.key_width+2, y + self.key_height+2), theme["border_color"], -1)
-                    overlay = cv2.addWeighted(overlay, 0.9, glow_overlay, 0.1, 0)
-                font_scale = 0.6 * self.scale_factor
-                text_size = self.get_text_size(key, font_scale=font_scale)
-                text_width, text_height = text_size
-                text_x = x + (self.key_width - text_width) // 2
-                text_y = y + (self.key_height + text_height) // 2
-                if text_width > self.key_width - 10:
-                    font_scale = 0.4 * self.scale_factor
-                    text_size = self.get_text_size(key, font_scale=font_scale)
-                    text_width, text_height = text_size
-                    text_x = x + (self.key_width - text_width) // 2
-                    text_y = y + (self.key_height + text_height) // 2
-                text_color = theme["text_active"] if key in self.key_animations else theme["text_color"]
-                cv2.putText(overlay, key, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, text_color, 2)
+        for word, x, y, slot_w, slot_h in self.get_suggestion_slots(hand_center):
+            self.compositor.damage(x - 2, y - 2, x + slot_w + 3, y + slot_h + 3)
+            hovered = word in self.hovered_suggestions
+            cv2.rectangle(overlay, (x, y), (x + slot_w, y + slot_h), theme["key_hover"] if hovered else theme["bg_color"], -1)
+            cv2.rectangle(overlay, (x, y), (x + slot_w, y + slot_h), theme["border_color"], 1)
+            label = word.upper() if self.current_word().isupper() else word
+            text_w, text_h = self.get_text_size(label, font_scale=0.7)
+            self.put_text(overlay, label, (x + (slot_w - text_w) // 2, y + (slot_h + text_h) // 2), 0.7,
+                          (0, 0, 0) if hovered else theme["text_active"], 2)
         return overlay
 
-    def process_finger_input(self, overlay, x, y, hand_label, hand_center):
-        theme = self.get_current_theme()
-        keys = self.layouts[self.current_layout]
-        for row_idx, row in enumerate(keys):
-            for coll_idx, key in enumerate(row):
-                base_x = self.key_start_x + self.keyboard_offset_x + coll_idx * (self.key_width + self.spacing)
-                base_y = self.key_start_y + self.keyboard_offset_y + row_idx * (self.key_height + self.spacing)
-                key_x, key_y = self.get_curved_position(base_x, base_y, hand_center) if self.follow_hand and hand_center else (base_x, base_y)
-                if self.is_finger_touching(x, y, key_x, key_y, self.key_width, self.key_height):
-                    cv2.rectangle(overlay, (key_x, key_y), (key_x + self.key_width, key_y + self.key_height), theme["key_hover"], -1)
-                    font_scale = 0.6 * self.scale_factor
-                    text_size = self.get_text_size(key, font_scale=font_scale)
-                    text_width, text_height = text_size
-                    text_x = key_x + (self.key_width - text_width) // 2
-                    text_y = key_y + (self.key_height + text_height) // 2
-                    if text_width > self.key_width - 10:
-                        font_scale = 0.4 * self.scale_factor
-                        text_size = self.get_text_size(key, font_scale=font_scale)
-                        text_width, text_height = text_size
-                        text_x = key_x + (self.key_width - text_width) // 2
-                        text_y = key_y + (self.key_height + text_height) // 2
-                    cv2.putText(overlay, key, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), 2)
-                    if self.last_pressed[hand_label] != key:
-                        self.pressed_time[hand_label] = time.time()
-                        self.last_pressed[hand_label] = key
-                    elif time.time() - self.pressed_time[hand_label] > 0.6:
-                        self.key_animations[key] = {'pulse': 1.0, 'active': True, 'start_time': time.time()}
-                        self.play_key_sound()
-                        if key in ["Backspace", "Enter", "Space", "Theme", "Layout", "Size+", "Size-", "Game", "Draw", "Photo"]:
-                            self.handle_special_keys(key)
-                        else:
-                            self.typed_text += key
-                        self.last_pressed[hand_label] = ""
-                        self.animate_key_press(key, time.time())
+    def process_finger_input(self, overlay, x, y, hand_label, hand_center, hand_landmarks=None, now=None):
+        now = time.time() if now is None else now
+        hit = self.get_key_geometry(hand_center).hit(x, y)
+        target = hit[0] if hit else None
+        if hit is not None:
+            self.hovered_keys[hand_label] = hit
+        else:
+            for word, sx, sy, slot_w, slot_h in self.get_suggestion_slots(hand_center):
+                if sx <= x < sx + slot_w and sy <= y < sy + slot_h:
+                    self.hovered_suggestions.add(word)
+                    target = ("suggestion", word)
+                    break
+        key = self.press_detector.update(hand_label, target, hand_landmarks, now)
+        if key is None:
+            return overlay
+        self.press_detector.pressed(key, now)
+        if isinstance(key, tuple):
+            self.sounds.play("special")
+            self.accept_suggestion(key[1])
+            return overlay
+        self.key_animations[key] = {'pulse': 1.0, 'active': True, 'start_time': time.time()}
+        self.play_key_sound(key)
+        if key in ["Backspace", "Enter", "Space", "Theme", "Layout", "Size+", "Size-", "Game", "Draw", "Photo"]:
+            self.handle_special_keys(key)
+        else:
+            self.typed_text += key
+        self.animate_key_press(key, time.time())
         return overlay
 
-    def process_drawing(self, overlay, finger_pos):
-        if finger_pos and self.drawing_canvas is not None:
-            current_point = finger_pos
-            if self.last_point is not None:
-                cv2.line(self.drawing_canvas, self.last_point, current_point, self.current_color, self.brush_size)
-            self.last_point = current_point
-            overlay = cv2.addWeighted(overlay, 0.8, self.drawing_canvas, 0.5, 0)
+    def keyboard_visible(self, hand_landmarks, thumb_pos, pinky_pos):
+        if self.press_detector.holds_keyboard(hand_landmarks):
+            return True
+        distance = self.calculate_distance(thumb_pos, pinky_pos)
+        return distance > self.show_threshold and distance >= self.hide_threshold
+
+    def cycle_press_mode(self):
+        self.press_mode = (self.press_mode + 1) % len(self.press_detectors)
+        self.press_detector = self.press_detectors[self.press_mode]
+        self.press_detector.reset()
+
+    def in_draw_panel(self, point):
+        x1, y1, x2, y2 = self.draw_panel
+        return x1 <= point[0] <= x2 and y1 <= point[1] <= y2
+
+    def process_drawing(self, overlay, finger_pos, pen_up=False):
+        if self.drawing is None:
+            return overlay
+        if not finger_pos or pen_up or self.in_draw_panel(finger_pos):
+            self.drawing.end()
+            return overlay
+        if self.drawing_canvas is not None:
+            if not self.drawing.matches(self.current_color, self.brush_size):
+                self.drawing.begin(finger_pos, self.current_color, self.brush_size)
+                self.drawing_canvas.line(finger_pos, finger_pos, self.current_color, self.brush_size)
+            else:
+                segment = self.drawing.extend(finger_pos)
+                if segment is not None:
+                    self.drawing_canvas.line(segment[0], segment[1], self.current_color, self.brush_size)
         return overlay
 
+    def undo_drawing(self):
+        if self.drawing is not None and self.drawing.undo():
+            self.drawing.rasterize(self.drawing_canvas)
+
+    def redo_drawing(self):
+        if self.drawing is not None and self.drawing.redo():
+            self.drawing.rasterize(self.drawing_canvas)
+
+    def export_drawing(self):
+        if self.drawing is None:
+            return None
+        try:
+            os.makedirs(self.photo_save_dir, exist_ok=True)
+            base = os.path.join(self.photo_save_dir, f"drawing_{time.strftime('%Y%m%d_%H%M%S')}")
+            self.drawing.save(base + ".json")
+            self.drawing.save(base + ".svg")
+            self.drawing_status = f"Tersimpan: {os.path.basename(base)}.json/.svg"
+            return base + ".json"
+        except Exception:
+            self.drawing_status = "Gagal simpan gambar"
+            return None
+
+    def import_drawing(self, path):
+        if not self.draw_mode:
+            self.toggle_draw_mode()
+        canvas = self.drawing_canvas
+        if canvas.image is None:
+            canvas.ensure_shape((int(self.source.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(self.source.get(cv2.CAP_PROP_FRAME_WIDTH))))
+        height, width = canvas.image.shape[:2]
+        self.drawing.load(path, width, height)
+        self.drawing.rasterize(canvas)
+        self.drawing_status = f"Dimuat: {os.path.basename(path)}"
+
     def draw_text_display(self, overlay):
         if self.typed_text:
             theme = self.get_current_theme()
@@ -829,12 +2946,15 @@ class VirtualKeyboard:
             font_scale = 1.5 * self.scale_factor
             text_size = self.get_text_size(self.typed_text, font_scale=font_scale, thickness=3)
             text_width, text_height = text_size
+            self.compositor.damage(text_x - 20, text_y - text_height - 20, text_x + text_width + 21, text_y + 31)
             cv2.rectangle(overlay, (text_x - 10, text_y - text_height - 10), (text_x + text_width + 10, text_y + 10), theme["bg_color"], -1)
             cv2.rectangle(overlay, (text_x - 10, text_y - text_height - 10), (text_x + text_width + 10, text_y + 10), theme["border_color"], 2)
-            cv2.putText(overlay, self.typed_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, theme["text_active"], 3)
+            self.put_text(overlay, self.typed_text, (text_x, text_y), font_scale, theme["text_active"], 3)
 
     def draw_info_panel(self, overlay):
         theme = self.get_current_theme()
+        self.compositor.damage(0, 0, overlay.shape[1], 45)
+        self.compositor.damage(0, overlay.shape[0] - 55, overlay.shape[1], overlay.shape[0])
         if self.draw_mode:
             info_text = "DRAW MODE - Use finger to draw, select color, or exit"
         elif self.game_mode:
@@ -848,8 +2968,9 @@ class VirtualKeyboard:
         elif self.photo_mode:
             info_text = "PHOTO MODE - Pinch untuk countdown & simpan"
         else:
-            info_text = f"Layout: {self.current_layout} | Theme: {self.current_theme} | Scale: {self.scale_factor:.1f}x"
-        cv2.putText(overlay, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, theme["text_color"], 2)
+            info_text = f"Layout: {self.current_layout} | Theme: {self.current_theme} | Scale: {self.scale_factor:.1f}x | Press: {self.press_detector.name}"
+        self.put_text(overlay, info_text, (10, 30), 0.7, theme["text_color"], 2)
+        self.draw_recording_indicator(overlay)
         if self.game_mode and self.current_game and self.current_game != "menu":
             instructions = self.get_game_instructions()
         elif self.game_mode:
@@ -864,7 +2985,7 @@ class VirtualKeyboard:
             instructions = "Pinch jempol + telunjuk untuk mulai countdown 3 detik, foto tersimpan otomatis"
         else:
             instructions = "Spread fingers to show keyboard | Point to type | Game or Draw button"
-        cv2.putText(overlay, instructions, (10, overlay.shape[0] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, theme["text_color"], 1)
+        self.put_text(overlay, instructions, (10, overlay.shape[0] - 20), 0.5, theme["text_color"], 1)
         credit_text = "Created by Riani Destanti, Fullstack Developer at Sobat Teknologi"
         credit_scale = 0.5
         credit_thickness = 1
@@ -889,20 +3010,100 @@ class VirtualKeyboard:
         cv2.rectangle(overlay, (accent_x, credit_y + 4), (accent_x + accent_width, credit_y + box_h - 4), accent_color, -1)
         text_x = credit_x + padding + extra_left
         text_y = credit_y + box_h - padding - 2
-        cv2.putText(overlay, credit_text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, credit_scale, theme["text_color"], credit_thickness, cv2.LINE_AA)
+        self.put_text(overlay, credit_text, (text_x, text_y), credit_scale, theme["text_color"], credit_thickness, cv2.LINE_AA)
+
+    def toggle_perf_hud(self):
+        self.show_perf_hud = not self.show_perf_hud
+        self.profiler.enabled = self.show_perf_hud
+        if self.show_perf_hud:
+            self.profiler.reset()
+
+    def draw_perf_hud(self, overlay):
+        if not self.show_perf_hud:
+            return overlay
+        theme = self.get_current_theme()
+        budget = 1000.0 / (self.target_fps or 30)
+        row_h = 22
+        panel_w = 330
+        panel_h = 60 + row_h * len(self.hud_stages)
+        x = overlay.shape[1] - panel_w - 14
+        y = 120
+        self.compositor.damage(x - 2, y - 2, x + panel_w + 3, y + panel_h + 3)
+        cv2.rectangle(overlay, (x, y), (x + panel_w, y + panel_h), theme["bg_color"], -1)
+        cv2.rectangle(overlay, (x, y), (x + panel_w, y + panel_h), theme["border_color"], 1)
+        frame_hist = self.profiler.histograms.get("frame")
+        frame_ms = frame_hist.mean() if frame_hist else 0.0
+        fps = 1000.0 / frame_ms if frame_ms else 0.0
+        stats = self.capture.stats()
+        header = f"{fps:5.1f} FPS  {frame_ms:5.1f} ms  drop {stats['dropped']}  miss {self.pacer.missed_deadlines}"
+        cv2.putText(overlay, header, (x + 10, y + 22), cv2.FONT_HERSHEY_SIMPLEX, 0.45, theme["text_active"], 1)
+        text_stats = self.text_cache.stats()
+        lead = min(self.finger_filter.latency, self.finger_filter.max_lead) * 1000.0 if self.finger_filter.enabled else 0.0
+        cv2.putText(overlay, f"budget {budget:.1f} ms  text {text_stats['hit_rate']:.0%}  lead {lead:.0f} ms",
+                    (x + 10, y + 42), cv2.FONT_HERSHEY_SIMPLEX, 0.4, theme["text_color"], 1)
+        bar_x = x + 150
+        bar_w = panel_w - 160
+        for idx, stage in enumerate(self.hud_stages):
+            hist = self.profiler.histograms.get(stage)
+            ms = hist.mean() if hist else 0.0
+            share = ms / budget
+            row_y = y + 60 + idx * row_h
+            self.put_text(overlay, stage, (x + 10, row_y + 12), 0.4, theme["text_color"], 1)
+            cv2.putText(overlay, f"{ms:.1f}ms", (x + 92, row_y + 12), cv2.FONT_HERSHEY_SIMPLEX, 0.4, theme["text_color"], 1)
+            color = (0, 200, 0) if share < 0.5 else (0, 165, 255) if share < 1.0 else (0, 0, 255)
+            cv2.rectangle(overlay, (bar_x, row_y), (bar_x + bar_w, row_y + 14), theme["key_color"], -1)
+            cv2.rectangle(overlay, (bar_x, row_y), (bar_x + int(bar_w * min(1.0, share)), row_y + 14), color, -1)
+        return overlay
 
     async def run(self):
-        while self.cap.isOpened():
-            success, frame = self.cap.read()
+        self.capture.start()
+        self.pacer.reset()
+        profiler = self.profiler
+        while self.capture.isOpened():
+            frame_start = time.perf_counter()
+            with profiler.span("capture"):
+                success, frame = self.capture.read()
             if not success:
                 break
-            frame = cv2.flip(frame, 1)
-            h, w, _ = frame.shape
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb_frame)
-            face_results = self.face_mesh.process(rgb_frame) if self.meme_mode else None
-            pose_results = self.pose.process(rgb_frame) if self.pushup_mode else None
+            with profiler.span("convert"):
+                frame = cv2.flip(frame, 1) if self.source.mirror else frame
+                h, w, _ = frame.shape
+                rgb_frame = cv2.cvtColor(self.get_inference_frame(frame), cv2.COLOR_BGR2RGB)
+            self.frame_id += 1
+            with profiler.span("inference"):
+                inference = self.inference.run(self.frame_id, {
+                    "hands": (self.hands, rgb_frame),
+                    "face": (self.face_mesh, self.face_roi.crop(rgb_frame)) if self.meme_mode else None,
+                    "pose": (self.pose, self.pose_roi.crop(rgb_frame)) if self.pushup_mode else None
+                })
+            for model, elapsed in self.inference.timings.items():
+                profiler.record(f"inference.{model}", elapsed)
+            overlay_start = time.perf_counter()
+            self.hovered_keys = {}
+            self.hovered_suggestions = set()
+            frame_stamp = self.capture.last_timestamp or frame_start
+            self.finger_filter.begin_frame()
+            results = inference["hands"]
+            if self.landmark_recorder is not None:
+                self.landmark_recorder.write(frame_stamp, w, h, results)
+            face_results = inference["face"]
+            pose_results = inference["pose"]
+            if face_results is not None:
+                faces = face_results.multi_face_landmarks or []
+                for face in faces:
+                    self.face_roi.map_back(face)
+                self.face_roi.update(faces[0] if faces else None)
+            else:
+                self.face_roi.reset()
+            if pose_results is not None:
+                self.pose_roi.update(self.pose_roi.map_back(pose_results.pose_landmarks))
+            else:
+                self.pose_roi.reset()
             overlay = frame.copy()
+            self.compositor.begin(frame.shape)
+            if self.drawing_canvas is not None:
+                self.drawing_canvas.ensure_shape(frame.shape)
+                self.drawing.height, self.drawing.width = frame.shape[:2]
             hand_center = None
             finger_pos = None
             primary_hand = None
@@ -912,6 +3113,7 @@ class VirtualKeyboard:
                     if primary_hand is None:
                         primary_hand = hand_landmarks
                     hand_label = results.multi_handedness[hand_idx].classification[0].label.lower()
+                    self.damage_landmarks(hand_landmarks, w, h, 12)
                     self.mp_drawing.draw_landmarks(overlay, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
                     thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
                     pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
@@ -919,17 +3121,16 @@ class VirtualKeyboard:
                     thumb_x, thumb_y = int(thumb_tip.x * w), int(thumb_tip.y * h)
                     pinky_x, pinky_y = int(pinky_tip.x * w), int(pinky_tip.y * h)
                     hand_center = ((thumb_x + pinky_x) // 2, (thumb_y + pinky_y) // 2)
-                    finger_pos = (int(index_finger_tip.x * w), int(index_finger_tip.y * h))
+                    filter_key = hand_label if hand_label not in self.finger_filter.seen else f"{hand_label}-{hand_idx}"
+                    finger_pos = self.finger_filter.update(filter_key, (index_finger_tip.x * w, index_finger_tip.y * h), frame_stamp, (w, h))
+                    self.compositor.damage_points([finger_pos], 10)
                     cv2.circle(overlay, finger_pos, 8, (0, 255, 0), -1)
                     if not self.game_mode and not self.draw_mode and not self.meme_mode and not self.pushup_mode and not self.photo_mode:
-                        distance = self.calculate_distance((thumb_x, thumb_y), (pinky_x, pinky_y))
-                        self.show_keyboard = distance > self.show_threshold
-                        if distance < self.hide_threshold:
-                            self.show_keyboard = False
+                        self.show_keyboard = self.keyboard_visible(hand_landmarks, (thumb_x, thumb_y), (pinky_x, pinky_y))
                         if self.show_keyboard:
-                            overlay = self.process_finger_input(overlay, finger_pos[0], finger_pos[1], hand_label, hand_center)
+                            overlay = self.process_finger_input(overlay, finger_pos[0], finger_pos[1], hand_label, hand_center, hand_landmarks)
                     elif self.draw_mode:
-                        overlay = self.process_drawing(overlay, finger_pos)
+                        overlay = self.process_drawing(overlay, finger_pos, self.is_pinch_gesture(hand_landmarks, w, h))
                     elif self.photo_mode:
                         pass
                     if self.game_mode and self.current_game in self.games:
@@ -948,14 +3149,23 @@ class VirtualKeyboard:
                 self.update_meme_state(predicted)
                 meme_image = self.get_meme_image(h, w)
             if self.draw_mode:
+                if finger_pos is None and self.drawing is not None:
+                    self.drawing.end()
                 overlay = self.draw_color_picker(overlay, finger_pos)
                 if self.drawing_canvas is not None:
-                    overlay = cv2.addWeighted(overlay, 0.8, self.drawing_canvas, 0.5, 0)
+                    stroke_box = self.drawing_canvas.composite(overlay)
+                    if stroke_box is not None:
+                        self.compositor.damage(*stroke_box)
             elif self.game_mode:
                 if self.current_game == "menu":
                     overlay = self.draw_game_menu(overlay, finger_pos)
                 elif self.current_game in self.games:
-                    overlay = self.games[self.current_game].update(overlay, finger_pos, self.typed_text)
+                    game = self.games[self.current_game]
+                    self.damage_game(game)
+                    overlay = game.update(overlay, finger_pos, self.typed_text)
+                    self.play_game_sounds(self.current_game, game)
+                    if game.win:
+                        self.compositor.damage_all()
                     overlay = self.draw_finish_button(overlay, finger_pos, self.games[self.current_game].game_area)
             elif self.pushup_mode:
                 overlay = self.update_pushup_counter(overlay, pose_results.pose_landmarks if pose_results else None, w, h)
@@ -968,25 +3178,29 @@ class VirtualKeyboard:
                     self.draw_text_display(overlay)
             overlay = self.draw_quick_shortcuts(overlay, finger_pos)
             self.draw_info_panel(overlay)
+            overlay = self.draw_perf_hud(overlay)
             for key in list(self.key_animations.keys()):
                 self.animate_key_press(key, time.time() - 0.1)
                 if key not in self.key_animations:
                     self.key_animations.pop(key, None)
-            display_frame = cv2.addWeighted(overlay, 0.8, frame, 0.2, 0)
+            composite_start = time.perf_counter()
+            profiler.record("overlay", (composite_start - overlay_start) * 1000.0)
+            if self.record_raw:
+                self.recorder.push(frame, frame_stamp)
+            display_frame = self.compositor.composite(overlay, frame)
             if self.meme_mode:
                 if meme_image is not None:
-                    target_w = max(80, int(display_frame.shape[1] * self.meme_width_fraction))
-                    meme_scaled = cv2.resize(meme_image, (target_w, display_frame.shape[0]))
-                    x1 = display_frame.shape[1] - target_w
-                    x2 = display_frame.shape[1]
-                    display_frame[:, x1:x2] = meme_scaled
-                    cv2.rectangle(display_frame, (x1, 0), (x2 - 1, display_frame.shape[0] - 1), (255, 255, 255), 2)
+                    np.copyto(display_frame[:, display_frame.shape[1] - meme_image.shape[1]:], meme_image)
                 else:
-                    cv2.putText(display_frame, "Meme image missing - check JPG files", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                    self.put_text(display_frame, "Meme image missing - check JPG files", (10, 90), 0.7, (0, 0, 255), 2)
             if self.photo_mode:
                 display_frame = self.handle_photo_mode(display_frame, frame, photo_pinch)
-            cv2.imshow('Virtual Keyboard', display_frame)
-            key = cv2.waitKey(1) & 0xFF
+            profiler.record("composite", (time.perf_counter() - composite_start) * 1000.0)
+            if not self.record_raw:
+                self.recorder.push(display_frame, frame_stamp)
+            with profiler.span("display"):
+                key = self.sink.show(display_frame)
+            self.finger_filter.observe_latency(time.perf_counter() - frame_stamp)
             if key == ord('q'):
                 break
             elif key == ord('g'):
@@ -999,165 +3213,455 @@ class VirtualKeyboard:
                 self.toggle_pushup_mode()
             elif key == ord('f'):
                 self.toggle_photo_mode()
-            await asyncio.sleep(1.0 / 60)  
-        self.cap.release()
-        cv2.destroyAllWindows()
+            elif key == ord('h'):
+                self.toggle_perf_hud()
+            elif key == ord('v'):
+                self.toggle_recording()
+            elif key == ord('t'):
+                self.cycle_press_mode()
+            elif key == ord('l'):
+                self.finger_filter.enabled = not self.finger_filter.enabled
+                self.finger_filter.reset()
+            elif key == ord('z') and self.draw_mode:
+                self.undo_drawing()
+            elif key == ord('x') and self.draw_mode:
+                self.redo_drawing()
+            elif key == ord('e') and self.draw_mode:
+                self.export_drawing()
+            with profiler.span("pace"):
+                await self.pacer.wait()
+            profiler.record("frame", (time.perf_counter() - frame_start) * 1000.0)
+            profiler.count("frames")
+        self.capture.release()
+        self.inference.shutdown()
+        if self.landmark_recorder is not None:
+            self.landmark_recorder.close()
+        self.photo_writer.close()
+        self.recorder.close()
+        self.sink.close()
         self.face_mesh.close()
         self.pose.close()
         pygame.mixer.quit()
 
 
+class ParticleSystem:
+    """Struct-of-arrays particles with vectorized updates, drawn into a reduced-resolution layer."""
+
+    def __init__(self, capacity=512, scale=0.5, seed=None):
+        self.capacity = capacity
+        self.scale = scale
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.gravity = np.zeros(2, dtype=np.float32)
+        self.wobble = 0.0
+        self.respawn = None
+        self.bounds = None
+        self.layer = None
+        self.mask = None
+        self._disks = {}
+
+    def clear(self):
+        self.alive[:] = False
+
+    def count(self):
+        return int(self.alive.sum())
+
+    def _sample(self, value, n):
+        if isinstance(value, tuple):
+            return self.rng.uniform(value[0], value[1], n).astype(np.float32)
+        return np.full(n, value, dtype=np.float32)
+
+    def spawn(self, count, x, y, vx, vy, size=(6, 12), color_low=(140, 120, 140), color_high=(255, 255, 255), life=np.inf):
+        slots = np.flatnonzero(~self.alive)[:count]
+        n = slots.size
+        if not n:
+            return 0
+        self.pos[slots, 0] = self._sample(x, n)
+        self.pos[slots, 1] = self._sample(y, n)
+        self.vel[slots, 0] = self._sample(vx, n)
+        self.vel[slots, 1] = self._sample(vy, n)
+        self.size[slots] = np.round(self._sample(size, n))
+        self.color[slots] = self.rng.integers(color_low, np.asarray(color_high) + 1, (n, 3))
+        self.life[slots] = self._sample(life, n)
+        self.alive[slots] = True
+        return n
+
+    def burst(self, x, y, count, speed=(80.0, 240.0), life=(0.35, 0.8), size=(3, 6), color=None):
+        slots = np.flatnonzero(~self.alive)[:count]
+        n = slots.size
+        if not n:
+            return 0
+        angle = self.rng.uniform(0.0, 2 * np.pi, n)
+        magnitude = self.rng.uniform(speed[0], speed[1], n)
+        self.pos[slots] = (x, y)
+        self.vel[slots, 0] = np.cos(angle) * magnitude
+        self.vel[slots, 1] = np.sin(angle) * magnitude
+        self.size[slots] = np.round(self._sample(size, n))
+        if color is None:
+            self.color[slots] = self.rng.integers(120, 256, (n, 3))
+        else:
+            self.color[slots] = color
+        self.life[slots] = self._sample(life, n)
+        self.alive[slots] = True
+        return n
+
+    def update(self, dt, t=0.0):
+        alive = self.alive
+        if not alive.any():
+            return
+        if self.gravity.any():
+            self.vel[alive] += self.gravity * dt
+        self.pos[alive] += self.vel[alive] * dt
+        if self.wobble:
+            self.pos[alive, 0] += self.wobble * dt * np.sin(t * 8.0 + self.pos[alive, 1] * 0.02)
+        self.life[alive] -= dt
+        alive &= self.life > 0
+        if self.bounds is not None:
+            x0, y0, x1, y1 = self.bounds
+            px, py = self.pos[:, 0], self.pos[:, 1]
+            alive &= (px >= x0) & (px < x1) & (py >= y0) & (py < y1)
+        if self.respawn is not None:
+            x0, x1, y0, y1, floor = self.respawn
+            fallen = np.flatnonzero(alive & (self.pos[:, 1] > floor))
+            if fallen.size:
+                self.pos[fallen, 0] = self.rng.uniform(x0, x1, fallen.size)
+                self.pos[fallen, 1] = self.rng.uniform(y0, y1, fallen.size)
+
+    def begin_layer(self, shape):
+        h = max(1, int(shape[0] * self.scale))
+        w = max(1, int(shape[1] * self.scale))
+        if self.layer is None or self.layer.shape[:2] != (h, w):
+            self.layer = np.zeros((h, w, 3), dtype=np.uint8)
+            self.mask = np.zeros((h, w), dtype=np.uint8)
+        else:
+            self.layer.fill(0)
+            self.mask.fill(0)
+        return self.layer, self.mask
+
+    def _disk(self, radius):
+        offsets = self._disks.get(radius)
+        if offsets is None:
+            dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+            inside = dx * dx + dy * dy <= radius * radius
+            offsets = self._disks[radius] = (dy[inside], dx[inside])
+        return offsets
+
+    def draw(self, layer, mask=None):
+        idx = np.flatnonzero(self.alive)
+        if not idx.size:
+            return
+        h, w = layer.shape[:2]
+        points = np.round(self.pos[idx] * self.scale).astype(np.int32)
+        radii = np.maximum(1, np.round(self.size[idx] * self.scale)).astype(np.int32)
+        colors = self.color[idx]
+        for radius in np.unique(radii):
+            sel = radii == radius
+            dy, dx = self._disk(int(radius))
+            ys = points[sel, 1][:, None] + dy
+            xs = points[sel, 0][:, None] + dx
+            ok = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+            layer[ys[ok], xs[ok]] = np.broadcast_to(colors[sel][:, None, :], ys.shape + (3,))[ok]
+            if mask is not None:
+                mask[ys[ok], xs[ok]] = 255
+
+    def blend(self, overlay, alpha):
+        bx, by, bw, bh = cv2.boundingRect(self.mask)
+        if not bw or not bh:
+            return overlay
+        fh, fw = overlay.shape[:2]
+        x0, y0 = int(bx / self.scale), int(by / self.scale)
+        x1 = min(fw, int(math.ceil((bx + bw) / self.scale)))
+        y1 = min(fh, int(math.ceil((by + bh) / self.scale)))
+        if x1 <= x0 or y1 <= y0:
+            return overlay
+        size = (x1 - x0, y1 - y0)
+        layer = cv2.resize(self.layer[by:by + bh, bx:bx + bw], size, interpolation=cv2.INTER_NEAREST)
+        mask = cv2.resize(self.mask[by:by + bh, bx:bx + bw], size, interpolation=cv2.INTER_NEAREST)
+        region = overlay[y0:y1, x0:x1]
+        blended = cv2.addWeighted(region, 1.0 - alpha, layer, alpha, 0)
+        np.copyto(region, blended, where=mask[..., None] > 0)
+        return overlay
+
+    def render(self, overlay, alpha=0.6):
+        if not self.alive.any():
+            return overlay
+        layer, mask = self.begin_layer(overlay.shape)
+        self.draw(layer, mask)
+        return self.blend(overlay, alpha)
+
+
 class WinCelebration:
     """Shared 10s win effect with confetti, glow, and rays."""
 
-    def __init__(self, duration=10.0):
+    def __init__(self, duration=10.0, confetti=140, text_cache=None):
         self.duration = duration
+        self.confetti = confetti
+        self.text_cache = text_cache if text_cache is not None else TextCache()
         self.active = False
         self.start_time = 0.0
-        self.confetti = []
+        self.last_update = 0.0
+        self.particles = ParticleSystem(capacity=confetti, scale=0.5)
         self.center = (0, 0)
 
     def reset(self):
         self.active = False
-        self.confetti = []
-
-    def is_active(self):
-        return self.active and (time.time() - self.start_time) < self.duration
-
-    def _spawn_confetti(self, w, h):
-        self.confetti = []
-        for _ in range(140):
-            self.confetti.append({
-                "pos": [random.randint(0, w), random.randint(-h // 3, h // 4)],
-                "vel": [random.uniform(-1.2, 1.2), random.uniform(3.5, 6.5)],
-                "color": (
-                    random.randint(140, 255),
-                    random.randint(120, 255),
-                    random.randint(140, 255)
-                ),
-                "size": random.randint(6, 12)
-            })
+        self.particles.clear()
 
-    def start(self, overlay):
+    def put_text(self, img, text, org, font_scale, color, thickness=1):
+        return self.text_cache.put(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
+
+    def is_active(self, now=None):
+        now = time.time() if now is None else now
+        return self.active and (now - self.start_time) < self.duration
+
+    def start(self, overlay, now=None):
         h, w = overlay.shape[:2]
         self.center = (w // 2, h // 2)
-        self._spawn_confetti(w, h)
-        self.start_time = time.time()
+        self.particles.clear()
+        self.particles.spawn(self.confetti, (0, w), (-h // 3, h // 4), (-36.0, 36.0), (105.0, 195.0), size=(6, 12))
+        self.particles.wobble = 30.0
+        self.particles.respawn = (0, w, -h // 5, 0, h + 20)
+        self.start_time = time.time() if now is None else now
+        self.last_update = self.start_time
         self.active = True
 
-    def draw(self, overlay, label="YOU WIN!", subtitle="Nikmati konfeti 10 detik"):
-        if not self.is_active():
+    def draw(self, overlay, label="YOU WIN!", subtitle="Nikmati konfeti 10 detik", now=None):
+        now = time.time() if now is None else now
+        if not self.is_active(now):
             self.reset()
             return overlay
-        progress = (time.time() - self.start_time) / self.duration
+        elapsed = now - self.start_time
+        progress = elapsed / self.duration
+        self.particles.update(min(0.1, max(0.0, now - self.last_update)), elapsed)
+        self.last_update = now
         h, w = overlay.shape[:2]
-        fx_layer = overlay.copy()
+        scale = self.particles.scale
+        layer, mask = self.particles.begin_layer(overlay.shape)
+        center = (int(self.center[0] * scale), int(self.center[1] * scale))
         pulse = 0.5 + 0.5 * math.sin(progress * math.pi * 2)
-        glow_radius = int(max(w, h) * (0.25 + 0.25 * pulse))
-        cv2.circle(fx_layer, self.center, glow_radius, (255, 255, 255), -1)
-        ring_radius = int(max(w, h) * (0.15 + progress * 0.35))
-        cv2.circle(fx_layer, self.center, ring_radius, (255, 215, 0), 6)
-        for c in self.confetti:
-            c["pos"][0] += c["vel"][0] + math.sin(progress * 8 + c["pos"][1] * 0.02)
-            c["pos"][1] += c["vel"][1]
-            if c["pos"][1] > h + 20:
-                c["pos"][0] = random.randint(0, w)
-                c["pos"][1] = random.randint(-h // 5, 0)
-            cv2.circle(fx_layer, (int(c["pos"][0]), int(c["pos"][1])), c["size"], c["color"], -1)
+        glow_radius = int(max(w, h) * (0.25 + 0.25 * pulse) * scale)
+        ring_radius = int(max(w, h) * (0.15 + progress * 0.35) * scale)
+        for img, white, gold in ((layer, (255, 255, 255), (255, 215, 0)), (mask, 255, 255)):
+            cv2.circle(img, center, glow_radius, white, -1)
+            cv2.circle(img, center, ring_radius, gold, 3)
+        self.particles.draw(layer, mask)
         beams = 24
+        length = int((0.35 + 0.4 * pulse) * max(w, h) * scale)
         for i in range(beams):
             angle = (i / beams) * math.tau
-            length = int((0.35 + 0.4 * pulse) * max(w, h))
-            end_x = int(self.center[0] + math.cos(angle) * length)
-            end_y = int(self.center[1] + math.sin(angle) * length)
-            cv2.line(fx_layer, self.center, (end_x, end_y), (255, 255, 255), 2)
-        overlay = cv2.addWeighted(overlay, 0.55, fx_layer, 0.45, 0)
+            end = (int(center[0] + math.cos(angle) * length), int(center[1] + math.sin(angle) * length))
+            cv2.line(layer, center, end, (255, 255, 255), 1)
+            cv2.line(mask, center, end, 255, 1)
+        overlay = self.particles.blend(overlay, 0.45)
         text_scale = 1.8
-        text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, text_scale, 4)[0]
+        text_size = self.text_cache.measure(label, cv2.FONT_HERSHEY_SIMPLEX, text_scale, 4)[0]
         text_x = self.center[0] - text_size[0] // 2
         text_y = self.center[1] - text_size[1] // 2
-        cv2.putText(overlay, label, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, text_scale, (0, 0, 0), 10)
-        cv2.putText(overlay, label, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, text_scale, (0, 255, 255), 4)
+        self.put_text(overlay, label, (text_x, text_y), text_scale, (0, 0, 0), 10)
+        self.put_text(overlay, label, (text_x, text_y), text_scale, (0, 255, 255), 4)
         sub_scale = 0.9
-        sub_size = cv2.getTextSize(subtitle, cv2.FONT_HERSHEY_SIMPLEX, sub_scale, 2)[0]
+        sub_size = self.text_cache.measure(subtitle, cv2.FONT_HERSHEY_SIMPLEX, sub_scale, 2)[0]
         sub_x = self.center[0] - sub_size[0] // 2
         sub_y = text_y + 60
-        cv2.putText(overlay, subtitle, (sub_x, sub_y), cv2.FONT_HERSHEY_SIMPLEX, sub_scale, (0, 0, 0), 6)
-        cv2.putText(overlay, subtitle, (sub_x, sub_y), cv2.FONT_HERSHEY_SIMPLEX, sub_scale, (50, 220, 255), 2)
-        timer_left = max(0, int(self.duration - (time.time() - self.start_time)))
-        cv2.putText(overlay, f"Auto reset {timer_left}s", (self.center[0] - 120, sub_y + 35),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self.put_text(overlay, subtitle, (sub_x, sub_y), sub_scale, (0, 0, 0), 6)
+        self.put_text(overlay, subtitle, (sub_x, sub_y), sub_scale, (50, 220, 255), 2)
+        timer_left = max(0, int(self.duration - elapsed))
+        self.put_text(overlay, f"Auto reset {timer_left}s", (self.center[0] - 120, sub_y + 35), 0.6, (255, 255, 255), 2)
         return overlay
 
 
-class PongGame:
-    def __init__(self):
-        self.game_area = (100, 100, 700, 500)
-        self.win_fx = WinCelebration()
+class Game:
+    """Mini game advanced on a fixed timestep; subclasses implement step(dt, finger_pos) and draw(overlay, alpha, win)."""
+
+    win_label = "YOU WIN!"
+    win_subtitle = "Konfeti 10 detik sebelum restart"
+    step_rate = 60
+    bot_reaction = 0.35
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        self.timestep = FixedTimestep(1.0 / self.step_rate, clock)
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.sim_time = 0.0
         self.win = False
-        self.reset()
+        self.win_started = 0.0
+        self.text_cache = TextCache()
+        self.win_fx = WinCelebration(text_cache=self.text_cache)
+        self.particles = None
+        self.headless = False
+        self.rounds = []
+        self.round_started = 0.0
         self.hand_landmarks = None
         self.mp_hands = None
 
+    def use_text_cache(self, text_cache):
+        self.text_cache = text_cache
+        self.win_fx.text_cache = text_cache
+
+    def put_text(self, img, text, org, font_scale, color, thickness=1):
+        return self.text_cache.put(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thickness)
+
+    def render_time(self):
+        return self.sim_time + self.timestep.alpha * self.timestep.dt
+
+    def lerp(self, previous, current, alpha):
+        return previous + (current - previous) * alpha
+
+    def progress(self):
+        return getattr(self, "score", 0)
+
+    def start_round(self):
+        self.round_started = self.sim_time
+        self.timestep.reset()
+
+    def end_round(self, outcome):
+        self.rounds.append((outcome, self.progress(), self.sim_time - self.round_started))
+
+    def set_win(self):
+        if not self.win:
+            self.win = True
+            self.win_started = self.sim_time
+            self.end_round("win")
+
+    def lose(self):
+        self.end_round("loss")
+        self.reset()
+
+    def bot(self):
+        return None
+
+    def tick(self, finger_pos):
+        dt = self.timestep.dt
+        self.sim_time += dt
+        if self.win:
+            if self.sim_time - self.win_started >= self.win_fx.duration:
+                self.reset()
+            return
+        if self.particles is not None and not self.headless:
+            self.particles.update(dt, self.sim_time)
+        self.step(dt, finger_pos)
+        if self.win and self.headless:
+            self.reset()
+
+    def run_headless(self, steps, driver=None):
+        driver = driver or (lambda game, i: game.bot())
+        first = len(self.rounds)
+        self.headless = True
+        start = time.perf_counter()
+        try:
+            for i in range(steps):
+                self.tick(driver(self, i))
+        finally:
+            self.headless = False
+        elapsed = time.perf_counter() - start
+        rounds = self.rounds[first:]
+        wins = [r for r in rounds if r[0] == "win"]
+        scores = [r[1] for r in rounds]
+        return {
+            "game": type(self).__name__,
+            "seed": self.seed,
+            "steps": steps,
+            "sim_seconds": round(steps * self.timestep.dt, 2),
+            "wall_seconds": round(elapsed, 4),
+            "steps_per_sec": round(steps / elapsed, 1) if elapsed else 0.0,
+            "wins": len(wins),
+            "losses": len(rounds) - len(wins),
+            "best_score": max(scores + [self.progress()]),
+            "mean_round_score": round(sum(scores) / len(scores), 2) if scores else None,
+            "mean_win_seconds": round(sum(r[2] for r in wins) / len(wins), 2) if wins else None,
+            "final_score": self.progress()
+        }
+
+    def update(self, overlay, finger_pos, typed_text=""):
+        for _ in range(self.timestep.advance()):
+            self.tick(finger_pos)
+        alpha = self.timestep.alpha
+        if self.win:
+            if not self.win_fx.active:
+                self.win_fx.start(overlay, self.win_started)
+            self.draw(overlay, alpha, win=True)
+            return self.win_fx.draw(overlay, label=self.win_label, subtitle=self.win_subtitle, now=self.render_time())
+        self.draw(overlay, alpha)
+        if self.particles is not None:
+            overlay = self.particles.render(overlay)
+        return overlay
+
+class PongGame(Game):
+    win_label = "PONG WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
+        self.game_area = (100, 100, 700, 500)
+        self.reset()
+
     def reset(self):
         self.win = False
         self.win_fx.reset()
+        self.start_round()
         self.paddle_y = 300
-        self.ball_x = 400
-        self.ball_y = 300
-        self.ball_dx = 5
-        self.ball_dy = 3
+        self.ball_x = 400.0
+        self.ball_y = 300.0
+        self.ball_dx = 150.0
+        self.ball_dy = 90.0
+        self.prev_ball = (self.ball_x, self.ball_y)
         self.score = 0
         self.paddle_width = 20
         self.paddle_height = 100
         self.ball_size = 15
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        if self.win:
-            self.draw(overlay)
-            overlay = self.win_fx.draw(overlay, label="PONG WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def step(self, dt, finger_pos):
+        self.prev_ball = (self.ball_x, self.ball_y)
         if finger_pos:
             self.paddle_y = max(self.game_area[1], min(self.game_area[3] - self.paddle_height, finger_pos[1] - self.paddle_height // 2))
-        self.ball_x += self.ball_dx
-        self.ball_y += self.ball_dy
-        if self.ball_y <= self.game_area[1] or self.ball_y >= self.game_area[3] - self.ball_size:
-            self.ball_dy = -self.ball_dy
+        self.ball_x += self.ball_dx * dt
+        self.ball_y += self.ball_dy * dt
+        if self.ball_y <= self.game_area[1]:
+            self.ball_dy = abs(self.ball_dy)
+        elif self.ball_y >= self.game_area[3] - self.ball_size:
+            self.ball_dy = -abs(self.ball_dy)
         if self.ball_x >= self.game_area[2] - self.ball_size:
-            self.ball_dx = -self.ball_dx
+            self.ball_dx = -abs(self.ball_dx)
         if self.ball_x <= self.game_area[0]:
-            self.reset()
-            return overlay
+            self.lose()
+            return
         paddle_x = self.game_area[0] + 30
-        if (self.ball_x <= paddle_x + self.paddle_width and self.ball_x >= paddle_x and
+        if (self.ball_dx < 0 and self.ball_x <= paddle_x + self.paddle_width and self.ball_x >= paddle_x and
                 self.ball_y >= self.paddle_y and self.ball_y <= self.paddle_y + self.paddle_height):
-            self.ball_dx = -self.ball_dx
+            self.ball_dx = abs(self.ball_dx)
             self.score += 1
-            if self.score >= 10 and not self.win:
-                self.win = True
-                self.win_fx.start(overlay)
-        self.draw(overlay)
-        return overlay
+            if self.score >= 10:
+                self.set_win()
 
-    def draw(self, overlay):
+    def bot(self):
+        return (self.game_area[0] + 40, int(self.ball_y))
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
         paddle_x = self.game_area[0] + 30
         cv2.rectangle(overlay, (paddle_x, self.paddle_y), (paddle_x + self.paddle_width, self.paddle_y + self.paddle_height), (0, 255, 0), -1)
-        cv2.circle(overlay, (int(self.ball_x), int(self.ball_y)), self.ball_size, (255, 255, 0), -1)
-        cv2.putText(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        ball_x = int(self.lerp(self.prev_ball[0], self.ball_x, alpha))
+        ball_y = int(self.lerp(self.prev_ball[1], self.ball_y, alpha))
+        cv2.circle(overlay, (ball_x, ball_y), self.ball_size, (255, 255, 0), -1)
+        self.put_text(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10), 0.7, (255, 255, 255), 2)
 
-class BrickBreakerGame:
-    def __init__(self):
+class BrickBreakerGame(Game):
+    win_label = "BRICK WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (120, 120, 680, 480)
-        self.win_fx = WinCelebration()
-        self.hand_landmarks = None
-        self.mp_hands = None
+        self.particles = ParticleSystem(capacity=256)
+        self.particles.bounds = self.game_area
+        self.particles.gravity[1] = 400.0
         self.paddle_width = 120
         self.paddle_height = 18
         self.ball_radius = 10
-        self.base_speed = 5.0
+        self.base_speed = 150.0
         self.rows = 4
         self.cols = 7
         self.brick_height = 22
@@ -1168,14 +3672,13 @@ class BrickBreakerGame:
     def reset(self):
         self.win = False
         self.win_fx.reset()
+        self.start_round()
+        self.particles.clear()
         self.score = 0
         self.lives = 3
         self.paddle_x = (self.game_area[0] + self.game_area[2]) // 2 - self.paddle_width // 2
         self.paddle_y = self.game_area[3] - 40
-        self.ball_x = float(self.paddle_x + self.paddle_width // 2)
-        self.ball_y = float(self.paddle_y - 30)
-        self.ball_dx = random.choice([-1, 1]) * self.base_speed
-        self.ball_dy = -self.base_speed
+        self._reset_ball()
         self.bricks = self._build_bricks()
 
     def _build_bricks(self):
@@ -1189,7 +3692,7 @@ class BrickBreakerGame:
                 y1 = top + self.brick_top_padding + row * (self.brick_height + self.brick_padding)
                 bricks.append({
                     "rect": (x1, y1, x1 + brick_width, y1 + self.brick_height),
-                    "color": (random.randint(120, 255), random.randint(150, 255), random.randint(150, 255))
+                    "color": (self.rng.randint(120, 255), self.rng.randint(150, 255), self.rng.randint(150, 255))
                 })
         return bricks
 
@@ -1206,27 +3709,25 @@ class BrickBreakerGame:
             self.ball_dy = -self.ball_dy
 
     def _reset_ball(self):
-        self.ball_x = self.paddle_x + self.paddle_width // 2
-        self.ball_y = self.paddle_y - 30
-        self.ball_dx = random.choice([-1, 1]) * self.base_speed
+        self.ball_x = float(self.paddle_x + self.paddle_width // 2)
+        self.ball_y = float(self.paddle_y - 30)
+        self.ball_dx = self.rng.choice([-1, 1]) * self.base_speed
         self.ball_dy = -self.base_speed
+        self.prev_ball = (self.ball_x, self.ball_y)
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        if self.win:
-            self.draw(overlay, win=True)
-            overlay = self.win_fx.draw(overlay, label="BRICK WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def step(self, dt, finger_pos):
+        self.prev_ball = (self.ball_x, self.ball_y)
         if finger_pos:
             self.paddle_x = max(self.game_area[0], min(self.game_area[2] - self.paddle_width, finger_pos[0] - self.paddle_width // 2))
-        self.ball_x += self.ball_dx
-        self.ball_y += self.ball_dy
+        self.ball_x += self.ball_dx * dt
+        self.ball_y += self.ball_dy * dt
         left, top, right, bottom = self.game_area
-        if self.ball_x - self.ball_radius <= left or self.ball_x + self.ball_radius >= right:
-            self.ball_dx = -self.ball_dx
+        if self.ball_x - self.ball_radius <= left:
+            self.ball_dx = abs(self.ball_dx)
+        elif self.ball_x + self.ball_radius >= right:
+            self.ball_dx = -abs(self.ball_dx)
         if self.ball_y - self.ball_radius <= top:
-            self.ball_dy = -self.ball_dy
+            self.ball_dy = abs(self.ball_dy)
         paddle_x2 = self.paddle_x + self.paddle_width
         if (self.ball_y + self.ball_radius >= self.paddle_y and
                 self.ball_y - self.ball_radius <= self.paddle_y + self.paddle_height and
@@ -1241,126 +3742,124 @@ class BrickBreakerGame:
                     self.ball_y + self.ball_radius > y1 and self.ball_y - self.ball_radius < y2):
                 self.bricks.remove(brick)
                 self.score += 1
+                if not self.headless:
+                    self.particles.burst((x1 + x2) / 2, (y1 + y2) / 2, 24, color=brick["color"])
                 self._bounce_from_brick(brick)
                 break
-        if not self.bricks and not self.win:
-            self.win = True
-            self.win_fx.start(overlay)
+        if not self.bricks:
+            self.set_win()
         if self.ball_y - self.ball_radius > bottom:
             self.lives -= 1
             if self.lives <= 0:
-                self.reset()
-                return overlay
+                self.lose()
+                return
             self._reset_ball()
-        self.draw(overlay)
-        return overlay
 
-    def draw(self, overlay, win=False):
+    def bot(self):
+        return (int(self.ball_x), self.paddle_y)
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
         cv2.rectangle(overlay, (self.paddle_x, self.paddle_y), (self.paddle_x + self.paddle_width, self.paddle_y + self.paddle_height), (120, 200, 255), -1)
-        cv2.circle(overlay, (int(self.ball_x), int(self.ball_y)), self.ball_radius, (255, 220, 120), -1)
+        ball_x = int(self.lerp(self.prev_ball[0], self.ball_x, alpha))
+        ball_y = int(self.lerp(self.prev_ball[1], self.ball_y, alpha))
+        cv2.circle(overlay, (ball_x, ball_y), self.ball_radius, (255, 220, 120), -1)
         for brick in self.bricks:
             x1, y1, x2, y2 = brick["rect"]
             cv2.rectangle(overlay, (x1, y1), (x2, y2), brick["color"], -1)
             cv2.rectangle(overlay, (x1, y1), (x2, y2), (255, 255, 255), 1)
-        cv2.putText(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(overlay, f"Nyawa: {self.lives}", (self.game_area[0] + 200, self.game_area[1] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 200, 200), 2)
-        cv2.putText(overlay, "Pindah paddle dengan jari, hancurkan semua brick", (self.game_area[0], self.game_area[3] + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 220, 255), 2)
+        self.put_text(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 12), 0.7, (255, 255, 255), 2)
+        self.put_text(overlay, f"Nyawa: {self.lives}", (self.game_area[0] + 200, self.game_area[1] - 12), 0.7, (255, 200, 200), 2)
+        self.put_text(overlay, "Pindah paddle dengan jari, hancurkan semua brick", (self.game_area[0], self.game_area[3] + 25), 0.6, (200, 220, 255), 2)
         if win:
-            cv2.putText(overlay, "WIN! Konfeti 10 detik", (self.game_area[0] + 160, self.game_area[1] + 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 3)
+            self.put_text(overlay, "WIN! Konfeti 10 detik", (self.game_area[0] + 160, self.game_area[1] + 200), 0.8, (0, 255, 0), 3)
 
-class CatchGame:
-    def __init__(self):
+class CatchGame(Game):
+    win_label = "CATCH WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (100, 100, 700, 500)
-        self.win_fx = WinCelebration()
-        self.win = False
         self.reset()
-        self.hand_landmarks = None
-        self.mp_hands = None
 
     def reset(self):
         self.win = False
         self.win_fx.reset()
+        self.start_round()
         self.basket_x = 400
         self.basket_width = 80
         self.basket_height = 20
         self.balls = []
         self.score = 0
-        self.last_spawn = time.time()
+        self.last_spawn = self.sim_time
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        if self.win:
-            self.draw(overlay)
-            overlay = self.win_fx.draw(overlay, label="CATCH WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def step(self, dt, finger_pos):
         if finger_pos:
             self.basket_x = max(self.game_area[0], min(self.game_area[2] - self.basket_width, finger_pos[0] - self.basket_width // 2))
-        if time.time() - self.last_spawn > 1.0:
+        if self.sim_time - self.last_spawn > 1.0:
             self.balls.append({
-                'x': random.randint(self.game_area[0] + 20, self.game_area[2] - 20),
+                'x': self.rng.randint(self.game_area[0] + 20, self.game_area[2] - 20),
                 'y': self.game_area[1],
-                'speed': random.randint(3, 8),
-                'color': (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
+                'py': self.game_area[1],
+                'speed': self.rng.randint(3, 8) * 30,
+                'color': (self.rng.randint(100, 255), self.rng.randint(100, 255), self.rng.randint(100, 255))
             })
-            self.last_spawn = time.time()
+            self.last_spawn = self.sim_time
+        basket_y = self.game_area[3] - 50
         for ball in self.balls[:]:
-            ball['y'] += ball['speed']
-            basket_y = self.game_area[3] - 50
+            ball['py'] = ball['y']
+            ball['y'] += ball['speed'] * dt
             if ball['y'] >= basket_y and ball['x'] >= self.basket_x and ball['x'] <= self.basket_x + self.basket_width:
                 self.balls.remove(ball)
                 self.score += 1
-                if self.score >= 10 and not self.win:
-                    self.win = True
-                    self.win_fx.start(overlay)
+                if self.score >= 10:
+                    self.set_win()
             elif ball['y'] > self.game_area[3]:
                 self.balls.remove(ball)
-        self.draw(overlay)
-        return overlay
 
-    def draw(self, overlay):
+    def bot(self):
+        if not self.balls:
+            return None
+        ball = max(self.balls, key=lambda b: b['y'])
+        return (ball['x'], self.game_area[3] - 50)
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
         basket_y = self.game_area[3] - 50
         cv2.rectangle(overlay, (self.basket_x, basket_y), (self.basket_x + self.basket_width, basket_y + self.basket_height), (139, 69, 19), -1)
         for ball in self.balls:
-            cv2.circle(overlay, (int(ball['x']), int(ball['y'])), 10, ball['color'], -1)
-        cv2.putText(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            cv2.circle(overlay, (int(ball['x']), int(self.lerp(ball['py'], ball['y'], alpha))), 10, ball['color'], -1)
+        self.put_text(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10), 0.7, (255, 255, 255), 2)
 
-class SnakeGame:
-    def __init__(self):
+class SnakeGame(Game):
+    win_label = "SNAKE WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (100, 100, 700, 500)
         self.grid_size = 20
-        self.win_fx = WinCelebration()
-        self.win = False
+        self.move_interval = 0.2
         self.reset()
-        self.hand_landmarks = None
-        self.mp_hands = None
 
     def reset(self):
         self.win = False
         self.win_fx.reset()
+        self.start_round()
         self.snake = [(400, 300), (380, 300), (360, 300)]
         self.direction = (20, 0)
         self.food = self.spawn_food()
         self.score = 0
-        self.last_move = time.time()
+        self.last_move = self.sim_time
 
     def spawn_food(self):
         while True:
-            x = random.randint(self.game_area[0] // self.grid_size, (self.game_area[2] - self.grid_size) // self.grid_size) * self.grid_size
-            y = random.randint(self.game_area[1] // self.grid_size, (self.game_area[3] - self.grid_size) // self.grid_size) * self.grid_size
+            x = self.rng.randint(self.game_area[0] // self.grid_size, (self.game_area[2] - self.grid_size) // self.grid_size) * self.grid_size
+            y = self.rng.randint(self.game_area[1] // self.grid_size, (self.game_area[3] - self.grid_size) // self.grid_size) * self.grid_size
             new_food = (x, y)
             if new_food not in self.snake:
                 return new_food
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        if self.win:
-            self.draw(overlay)
-            overlay = self.win_fx.draw(overlay, label="SNAKE WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def step(self, dt, finger_pos):
         if finger_pos and len(self.snake) > 0:
             head_x, head_y = self.snake[0]
             dx = finger_pos[0] - head_x
@@ -1368,51 +3867,53 @@ class SnakeGame:
             new_direction = (self.grid_size if dx > 0 else -self.grid_size, 0) if abs(dx) > abs(dy) else (0, self.grid_size if dy > 0 else -self.grid_size)
             if new_direction != (-self.direction[0], -self.direction[1]):
                 self.direction = new_direction
-        if time.time() - self.last_move > 0.2:
+        if self.sim_time - self.last_move >= self.move_interval:
             head_x, head_y = self.snake[0]
             new_head = (head_x + self.direction[0], head_y + self.direction[1])
             if (new_head[0] < self.game_area[0] or new_head[0] >= self.game_area[2] or
                     new_head[1] < self.game_area[1] or new_head[1] >= self.game_area[3] or
                     new_head in self.snake):
-                self.reset()
-                return overlay
+                self.lose()
+                return
             self.snake.insert(0, new_head)
             if abs(new_head[0] - self.food[0]) < self.grid_size and abs(new_head[1] - self.food[1]) < self.grid_size:
                 self.score += 1
-                if self.score >= 10 and not self.win:
-                    self.win = True
-                    self.win_fx.start(overlay)
+                if self.score >= 10:
+                    self.set_win()
                 self.food = self.spawn_food()
             else:
                 self.snake.pop()
-            self.last_move = time.time()
-        self.draw(overlay)
-        return overlay
+            self.last_move = self.sim_time
 
-    def draw(self, overlay):
+    def bot(self):
+        return self.food
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
         for i, segment in enumerate(self.snake):
             color = (0, 255, 0) if i == 0 else (0, 200, 0)
             cv2.rectangle(overlay, segment, (segment[0] + self.grid_size, segment[1] + self.grid_size), color, -1)
         cv2.rectangle(overlay, self.food, (self.food[0] + self.grid_size, self.food[1] + self.grid_size), (255, 0, 0), -1)
-        cv2.putText(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        self.put_text(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10), 0.7, (255, 255, 255), 2)
 
-class MemoryGame:
+class MemoryGame(Game):
     """
     Diganti menjadi game Target Tap:
     - Target bulat muncul acak, sentuh untuk skor.
     - Hit target 10x untuk menang.
     """
 
-    def __init__(self):
+    win_label = "TARGET TAP WIN!"
+    win_subtitle = "Konfeti 10 detik"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (200, 150, 600, 450)
         self.target_radius = 28
         self.target_pos = None
         self.spawn_interval = 1.2
         self.last_spawn = 0
         self.score = 0
-        self.win = False
-        self.win_fx = WinCelebration()
         self.instructions = [
             "1) Sentuh target bulat yang muncul.",
             "2) Target pindah setiap muncul/hit.",
@@ -1420,35 +3921,28 @@ class MemoryGame:
             "4) Capai skor 10 untuk menang."
         ]
         self.reset()
-        self.hand_landmarks = None
-        self.mp_hands = None
 
     def reset(self):
         self.score = 0
         self.win = False
         self.win_fx.reset()
-        self.last_spawn = time.time()
+        self.start_round()
+        self.last_spawn = self.sim_time
         self.target_pos = self.random_target()
 
     def random_target(self):
         margin = 60
-        x = random.randint(self.game_area[0] + margin, self.game_area[2] - margin)
-        y = random.randint(self.game_area[1] + margin, self.game_area[3] - margin)
+        x = self.rng.randint(self.game_area[0] + margin, self.game_area[2] - margin)
+        y = self.rng.randint(self.game_area[1] + margin, self.game_area[3] - margin)
         color = (
-            random.randint(100, 255),
-            random.randint(100, 255),
-            random.randint(100, 255)
+            self.rng.randint(100, 255),
+            self.rng.randint(100, 255),
+            self.rng.randint(100, 255)
         )
         return {"pos": (x, y), "color": color}
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        now = time.time()
-        if self.win:
-            self.draw(overlay, win=True)
-            overlay = self.win_fx.draw(overlay, label="TARGET TAP WIN!", subtitle="Konfeti 10 detik")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def step(self, dt, finger_pos):
+        now = self.sim_time
         if now - self.last_spawn > self.spawn_interval:
             self.target_pos = self.random_target()
             self.last_spawn = now
@@ -1458,42 +3952,46 @@ class MemoryGame:
             if dist <= self.target_radius:
                 self.score += 1
                 if self.score >= 10:
-                    self.win = True
-                    self.win_fx.start(overlay)
+                    self.set_win()
                 self.target_pos = self.random_target()
                 self.last_spawn = now
-        self.draw(overlay, win=False)
-        return overlay
 
-    def draw(self, overlay, win=False):
+    def bot(self):
+        if self.target_pos and self.sim_time - self.last_spawn > self.bot_reaction:
+            return self.target_pos["pos"]
+        return None
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (25, 25, 35), -1)
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
-        cv2.putText(overlay, "TARGET TAP", (240, 190), cv2.FONT_HERSHEY_SIMPLEX, 1.1, (255, 255, 255), 2)
-        cv2.putText(overlay, f"Score: {self.score}", (240, 220), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (200, 255, 200), 2)
+        self.put_text(overlay, "TARGET TAP", (240, 190), 1.1, (255, 255, 255), 2)
+        self.put_text(overlay, f"Score: {self.score}", (240, 220), 0.8, (200, 255, 200), 2)
         instr_x, instr_y = self.game_area[0] + 20, self.game_area[3] - 140
         cv2.rectangle(overlay, (instr_x - 10, instr_y - 60), (instr_x + 330, instr_y + 70), (45, 45, 60), -1)
         cv2.rectangle(overlay, (instr_x - 10, instr_y - 60), (instr_x + 330, instr_y + 70), (180, 180, 200), 1)
-        cv2.putText(overlay, "Langkah:", (instr_x, instr_y - 35), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self.put_text(overlay, "Langkah:", (instr_x, instr_y - 35), 0.6, (255, 255, 255), 2)
         for i, line in enumerate(self.instructions):
-            cv2.putText(overlay, line, (instr_x, instr_y - 10 + i * 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (220, 220, 220), 1)
+            self.put_text(overlay, line, (instr_x, instr_y - 10 + i * 20), 0.5, (220, 220, 220), 1)
         if self.target_pos:
             tx, ty = self.target_pos["pos"]
             cv2.circle(overlay, (tx, ty), self.target_radius, self.target_pos["color"], -1)
             cv2.circle(overlay, (tx, ty), self.target_radius, (255, 255, 255), 2)
         if win:
-            cv2.putText(overlay, "WIN! Konfeti 10 detik", (230, 420), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            self.put_text(overlay, "WIN! Konfeti 10 detik", (230, 420), 0.7, (0, 255, 0), 2)
 
-class WhackAMoleGame:
-    def __init__(self):
+class WhackAMoleGame(Game):
+    win_label = "MOLE WIN!"
+    win_subtitle = "Konfeti 10 detik sebelum ulang"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (200, 150, 600, 450)
-        self.win_fx = WinCelebration()
         self.radius = 30
         self.active_mole = None
-        self.last_spawn = time.time()
+        self.last_spawn = 0.0
         self.spawn_interval = 1.4
         self.mole_duration = 1.0
         self.score = 0
-        self.win = False
         self.speed_mul = 1.0
         self.reset()
 
@@ -1507,8 +4005,9 @@ class WhackAMoleGame:
         self.score = 0
         self.win = False
         self.win_fx.reset()
+        self.start_round()
         self.active_mole = None
-        self.last_spawn = time.time()
+        self.last_spawn = self.sim_time
         left, top, right, bottom = self.game_area
         width = right - left
         height = bottom - top
@@ -1525,17 +4024,11 @@ class WhackAMoleGame:
         ]
 
     def spawn_mole(self):
-        self.active_mole = random.choice(self.holes)
-        self.last_spawn = time.time()
+        self.active_mole = self.rng.choice(self.holes)
+        self.last_spawn = self.sim_time
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        now = time.time()
-        if self.win:
-            self.draw(overlay, win=True)
-            overlay = self.win_fx.draw(overlay, label="MOLE WIN!", subtitle="Konfeti 10 detik sebelum ulang")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def step(self, dt, finger_pos):
+        now = self.sim_time
         if self.active_mole is None or now - self.last_spawn > self.mole_duration:
             self.spawn_mole()
         if finger_pos and self.active_mole:
@@ -1543,81 +4036,82 @@ class WhackAMoleGame:
             if dist <= self.radius:
                 self.score += 1
                 if self.score >= 10:
-                    self.win = True
-                    self.win_fx.start(overlay)
+                    self.set_win()
                 self.active_mole = None
                 self.last_spawn = now
-        self.draw(overlay, win=False)
-        return overlay
 
-    def draw(self, overlay, win=False):
+    def bot(self):
+        if self.active_mole and self.sim_time - self.last_spawn > self.bot_reaction:
+            return self.active_mole
+        return None
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
         title_x = self.game_area[0] + 20
         title_y = self.game_area[1] + 30
-        cv2.putText(overlay, "WHACK A MOLE", (title_x, title_y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
-        cv2.putText(overlay, f"Score: {self.score}", (title_x, title_y + 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        self.put_text(overlay, "WHACK A MOLE", (title_x, title_y), 1.0, (255, 255, 255), 2)
+        self.put_text(overlay, f"Score: {self.score}", (title_x, title_y + 28), 0.8, (255, 255, 255), 2)
         for hole in self.holes:
             cv2.circle(overlay, hole, self.radius, (40, 40, 40), -1)
             cv2.circle(overlay, hole, self.radius, (255, 255, 255), 2)
         if self.active_mole:
             cv2.circle(overlay, self.active_mole, self.radius, (0, 200, 255), -1)
             cv2.circle(overlay, self.active_mole, self.radius, (255, 255, 255), 3)
-        cv2.putText(overlay, "Sentuh mole untuk skor. 10 = WIN", (title_x, self.game_area[3] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self.put_text(overlay, "Sentuh mole untuk skor. 10 = WIN", (title_x, self.game_area[3] - 20), 0.6, (255, 255, 255), 2)
         if win:
-            cv2.putText(overlay, "WIN! Konfeti 10 detik", (260, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            self.put_text(overlay, "WIN! Konfeti 10 detik", (260, 460), 0.7, (0, 255, 0), 2)
 
-class BalloonPopGame:
-    def __init__(self):
+class BalloonPopGame(Game):
+    win_label = "BALLOON WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (200, 150, 600, 450)
-        self.win_fx = WinCelebration()
         self.balloons = []
-        self.last_spawn = time.time()
+        self.last_spawn = 0.0
         self.spawn_interval = 1.2
         self.radius = 30
-        self.speed_range = (1.5, 2.5)
+        self.speed_range = (45.0, 75.0)
+        self.particles = ParticleSystem(capacity=256)
+        self.particles.bounds = self.game_area
         self.score = 0
-        self.win = False
         self.speed_mul = 1.0
         self.reset()
 
     def set_difficulty(self, multiplier):
         self.speed_mul = multiplier
         self.spawn_interval = max(0.5, 1.2 / multiplier)
-        low, high = 1.5 * multiplier, 2.5 * multiplier
+        low, high = 45.0 * multiplier, 75.0 * multiplier
         self.speed_range = (low, high)
         self.reset()
 
     def reset(self):
         self.balloons = []
-        self.last_spawn = time.time()
+        self.particles.clear()
+        self.last_spawn = self.sim_time
         self.score = 0
         self.win = False
         self.win_fx.reset()
+        self.start_round()
 
     def spawn_balloon(self):
-        x = random.randint(self.game_area[0] + self.radius, self.game_area[2] - self.radius)
+        x = self.rng.randint(self.game_area[0] + self.radius, self.game_area[2] - self.radius)
         y = self.game_area[3] - self.radius
-        speed = random.uniform(*self.speed_range)
+        speed = self.rng.uniform(*self.speed_range)
         color = (
-            random.randint(100, 255),
-            random.randint(100, 255),
-            random.randint(100, 255)
+            self.rng.randint(100, 255),
+            self.rng.randint(100, 255),
+            self.rng.randint(100, 255)
         )
-        self.balloons.append({"pos": [x, y], "speed": speed, "color": color})
+        self.balloons.append({"pos": [x, y], "py": y, "speed": speed, "color": color})
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        now = time.time()
-        if self.win:
-            self.draw(overlay, win=True)
-            overlay = self.win_fx.draw(overlay, label="BALLOON WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
-        if now - self.last_spawn > self.spawn_interval:
+    def step(self, dt, finger_pos):
+        if self.sim_time - self.last_spawn > self.spawn_interval:
             self.spawn_balloon()
-            self.last_spawn = now
+            self.last_spawn = self.sim_time
         for balloon in self.balloons[:]:
-            balloon["pos"][1] -= balloon["speed"]
+            balloon["py"] = balloon["pos"][1]
+            balloon["pos"][1] -= balloon["speed"] * dt
             if balloon["pos"][1] < self.game_area[1]:
                 self.balloons.remove(balloon)
         if finger_pos:
@@ -1626,61 +4120,70 @@ class BalloonPopGame:
                 dist = math.hypot(finger_pos[0] - bx, finger_pos[1] - by)
                 if dist <= self.radius:
                     self.score += 1
+                    if not self.headless:
+                        self.particles.burst(bx, by, 30, speed=(60.0, 200.0), color=balloon["color"])
                     if self.score >= 10:
-                        self.win = True
-                        self.win_fx.start(overlay)
+                        self.set_win()
                     self.balloons.remove(balloon)
-        self.draw(overlay, win=False)
-        return overlay
 
-    def draw(self, overlay, win=False):
+    def bot(self):
+        middle = (self.game_area[1] + self.game_area[3]) // 2
+        risen = [b for b in self.balloons if b["pos"][1] < middle]
+        if not risen:
+            return None
+        balloon = min(risen, key=lambda b: b["pos"][1])
+        return (int(balloon["pos"][0]), int(balloon["pos"][1]))
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
         title_x = self.game_area[0] + 20
         title_y = self.game_area[1] + 30
-        cv2.putText(overlay, "BALLOON POP", (title_x, title_y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
-        cv2.putText(overlay, f"Score: {self.score}", (title_x, title_y + 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        self.put_text(overlay, "BALLOON POP", (title_x, title_y), 1.0, (255, 255, 255), 2)
+        self.put_text(overlay, f"Score: {self.score}", (title_x, title_y + 28), 0.8, (255, 255, 255), 2)
         for balloon in self.balloons:
-            bx, by = int(balloon["pos"][0]), int(balloon["pos"][1])
+            bx, by = int(balloon["pos"][0]), int(self.lerp(balloon["py"], balloon["pos"][1], alpha))
             cv2.circle(overlay, (bx, by), self.radius, balloon["color"], -1)
             cv2.circle(overlay, (bx, by + self.radius), int(self.radius * 0.5), balloon["color"], 2)
-        cv2.putText(overlay, "Sentuh balon untuk pecahkan. 10 = WIN", (title_x, self.game_area[3] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self.put_text(overlay, "Sentuh balon untuk pecahkan. 10 = WIN", (title_x, self.game_area[3] - 20), 0.6, (255, 255, 255), 2)
         if win:
-            cv2.putText(overlay, "WIN! Konfeti 10 detik", (title_x + 30, self.game_area[3] - 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            self.put_text(overlay, "WIN! Konfeti 10 detik", (title_x + 30, self.game_area[3] - 50), 0.7, (0, 255, 0), 2)
 
-class DodgeGame:
-    def __init__(self):
+class DodgeGame(Game):
+    win_label = "DODGE WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (150, 130, 650, 480)
-        self.win_fx = WinCelebration()
         self.player_width = 70
         self.player_height = 20
         self.spawn_interval = 0.9
-        self.speed_range = (4.0, 7.0)
+        self.speed_range = (120.0, 210.0)
         self.target_clear = 20
         self.lives_max = 3
-        self.hand_landmarks = None
-        self.mp_hands = None
         self.reset()
 
     def reset(self):
         self.win = False
         self.win_fx.reset()
+        self.start_round()
         self.player_x = (self.game_area[0] + self.game_area[2]) // 2 - self.player_width // 2
         self.player_y = self.game_area[3] - 40
         self.obstacles = []
-        self.last_spawn = time.time()
+        self.last_spawn = self.sim_time
         self.cleared = 0
         self.lives = self.lives_max
 
     def spawn_meteor(self):
-        size = random.randint(18, 36)
-        x = random.randint(self.game_area[0] + size, self.game_area[2] - size)
-        speed = random.uniform(*self.speed_range)
+        size = self.rng.randint(18, 36)
+        x = self.rng.randint(self.game_area[0] + size, self.game_area[2] - size)
+        speed = self.rng.uniform(*self.speed_range)
         color = (
-            random.randint(160, 210),
-            random.randint(150, 200),
-            random.randint(220, 255)
+            self.rng.randint(160, 210),
+            self.rng.randint(150, 200),
+            self.rng.randint(220, 255)
         )
-        self.obstacles.append({"x": x, "y": self.game_area[1] - size, "size": size, "speed": speed, "color": color})
+        y = self.game_area[1] - size
+        self.obstacles.append({"x": x, "y": y, "py": y, "size": size, "speed": speed, "color": color})
 
     def check_collision(self, meteor):
         px1 = self.player_x
@@ -1692,38 +4195,41 @@ class DodgeGame:
         r = meteor["size"]
         return mx + r > px1 and mx - r < px2 and my + r > py1 and my - r < py2
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        now = time.time()
-        if self.win:
-            self.draw(overlay, win=True)
-            overlay = self.win_fx.draw(overlay, label="DODGE WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def progress(self):
+        return self.cleared
+
+    def step(self, dt, finger_pos):
         if finger_pos:
             self.player_x = max(self.game_area[0], min(self.game_area[2] - self.player_width, finger_pos[0] - self.player_width // 2))
-        if now - self.last_spawn > self.spawn_interval:
+        if self.sim_time - self.last_spawn > self.spawn_interval:
             self.spawn_meteor()
-            self.last_spawn = now
+            self.last_spawn = self.sim_time
         for meteor in self.obstacles[:]:
-            meteor["y"] += meteor["speed"]
+            meteor["py"] = meteor["y"]
+            meteor["y"] += meteor["speed"] * dt
             if meteor["y"] - meteor["size"] > self.game_area[3]:
                 self.obstacles.remove(meteor)
                 self.cleared += 1
-                if self.cleared >= self.target_clear and not self.win:
-                    self.win = True
-                    self.win_fx.start(overlay)
+                if self.cleared >= self.target_clear:
+                    self.set_win()
                 continue
             if self.check_collision(meteor):
                 self.obstacles.remove(meteor)
                 self.lives -= 1
                 if self.lives <= 0:
-                    self.reset()
-                    return overlay
-        self.draw(overlay)
-        return overlay
+                    self.lose()
+                    return
+
+    def bot(self):
+        threats = [m["x"] for m in self.obstacles if m["y"] > self.game_area[1] + 100]
+        if not threats:
+            return None
+        half = self.player_width // 2
+        lanes = range(self.game_area[0] + half, self.game_area[2] - half + 1, 10)
+        x = max(lanes, key=lambda lane: min(abs(lane - t) for t in threats))
+        return (x, self.player_y)
 
-    def draw(self, overlay, win=False):
+    def draw(self, overlay, alpha=1.0, win=False):
         y1, y2 = self.game_area[1], self.game_area[3]
         x1, x2 = self.game_area[0], self.game_area[2]
         region = overlay[y1:y2, x1:x2].copy()
@@ -1738,49 +4244,52 @@ class DodgeGame:
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]), (self.game_area[2], self.game_area[3]), frame_color, 2)
         cv2.rectangle(overlay, (int(self.player_x), int(self.player_y)), (int(self.player_x + self.player_width), int(self.player_y + self.player_height)), player_color, -1)
         for meteor in self.obstacles:
-            cv2.circle(overlay, (int(meteor["x"]), int(meteor["y"])), meteor["size"], meteor["color"], -1)
-            cv2.circle(overlay, (int(meteor["x"]), int(meteor["y"])), meteor["size"], frame_color, 2)
-        cv2.putText(overlay, f"Lolos: {self.cleared}/{self.target_clear}", (self.game_area[0], self.game_area[1] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.7, text_color, 2)
-        cv2.putText(overlay, f"Nyawa: {self.lives}", (self.game_area[0] + 220, self.game_area[1] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.7, accent_text, 2)
-        cv2.putText(overlay, "Geser jari kiri-kanan untuk menghindar", (self.game_area[0], self.game_area[3] + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, info_color, 2)
+            center = (int(meteor["x"]), int(self.lerp(meteor["py"], meteor["y"], alpha)))
+            cv2.circle(overlay, center, meteor["size"], meteor["color"], -1)
+            cv2.circle(overlay, center, meteor["size"], frame_color, 2)
+        self.put_text(overlay, f"Lolos: {self.cleared}/{self.target_clear}", (self.game_area[0], self.game_area[1] - 12), 0.7, text_color, 2)
+        self.put_text(overlay, f"Nyawa: {self.lives}", (self.game_area[0] + 220, self.game_area[1] - 12), 0.7, accent_text, 2)
+        self.put_text(overlay, "Geser jari kiri-kanan untuk menghindar", (self.game_area[0], self.game_area[3] + 25), 0.6, info_color, 2)
 
-class SpaceShooterGame:
-    def __init__(self):
+class SpaceShooterGame(Game):
+    win_label = "SHOOTER WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
         self.game_area = (140, 120, 660, 480)
-        self.win_fx = WinCelebration()
-        self.hand_landmarks = None
-        self.mp_hands = None
         self.player_width = 70
         self.player_height = 24
-        self.laser_speed = 11
+        self.laser_speed = 330.0
         self.fire_cooldown = 0.28
         self.spawn_interval = 1.0
-        self.speed_range = (2.8, 4.8)
+        self.speed_range = (84.0, 144.0)
         self.target_score = 12
         self.reset()
 
     def reset(self):
         self.win = False
         self.win_fx.reset()
+        self.start_round()
         self.player_x = (self.game_area[0] + self.game_area[2]) // 2
         self.player_y = self.game_area[3] - 40
         self.lasers = []
         self.asteroids = []
-        self.last_fire = time.time()
-        self.last_spawn = time.time()
+        self.last_fire = self.sim_time
+        self.last_spawn = self.sim_time
         self.score = 0
         self.lives = 3
 
     def spawn_asteroid(self):
-        size = random.randint(18, 32)
-        x = random.randint(self.game_area[0] + size, self.game_area[2] - size)
-        speed = random.uniform(*self.speed_range)
+        size = self.rng.randint(18, 32)
+        x = self.rng.randint(self.game_area[0] + size, self.game_area[2] - size)
+        speed = self.rng.uniform(*self.speed_range)
         color = (
-            random.randint(150, 220),
-            random.randint(100, 170),
-            random.randint(160, 255)
+            self.rng.randint(150, 220),
+            self.rng.randint(100, 170),
+            self.rng.randint(160, 255)
         )
-        self.asteroids.append({"x": x, "y": self.game_area[1] - size, "size": size, "speed": speed, "color": color})
+        y = self.game_area[1] - size
+        self.asteroids.append({"x": x, "y": y, "py": y, "size": size, "speed": speed, "color": color})
 
     def check_collision_player(self, meteor):
         px1 = self.player_x - self.player_width // 2
@@ -1792,45 +4301,35 @@ class SpaceShooterGame:
         r = meteor["size"]
         return mx + r > px1 and mx - r < px2 and my + r > py1 and my - r < py2
 
-    def update(self, overlay, finger_pos, typed_text=""):
-        now = time.time()
-        if self.win:
-            self.draw(overlay, win=True)
-            overlay = self.win_fx.draw(overlay, label="SHOOTER WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
+    def step(self, dt, finger_pos):
+        now = self.sim_time
         if finger_pos:
             min_x = self.game_area[0] + self.player_width // 2
             max_x = self.game_area[2] - self.player_width // 2
             self.player_x = max(min_x, min(max_x, finger_pos[0]))
         cooldown = max(0.18, self.fire_cooldown - (self.score * 0.01))
         if now - self.last_fire > cooldown:
-            self.lasers.append({"x": self.player_x, "y": self.player_y - self.player_height, "speed": self.laser_speed})
+            y = self.player_y - self.player_height
+            self.lasers.append({"x": self.player_x, "y": y, "py": y, "speed": self.laser_speed})
             self.last_fire = now
         spawn_rate = max(0.55, self.spawn_interval - self.score * 0.03)
         if now - self.last_spawn > spawn_rate:
             self.spawn_asteroid()
             self.last_spawn = now
         for laser in self.lasers[:]:
-            laser["y"] -= laser["speed"]
+            laser["py"] = laser["y"]
+            laser["y"] -= laser["speed"] * dt
             if laser["y"] < self.game_area[1]:
                 self.lasers.remove(laser)
         for meteor in self.asteroids[:]:
-            meteor["y"] += meteor["speed"]
-            if meteor["y"] - meteor["size"] > self.game_area[3]:
-                self.asteroids.remove(meteor)
-                self.lives -= 1
-                if self.lives <= 0:
-                    self.reset()
-                    return overlay
-                continue
-            if self.check_collision_player(meteor):
+            meteor["py"] = meteor["y"]
+            meteor["y"] += meteor["speed"] * dt
+            if meteor["y"] - meteor["size"] > self.game_area[3] or self.check_collision_player(meteor):
                 self.asteroids.remove(meteor)
                 self.lives -= 1
                 if self.lives <= 0:
-                    self.reset()
-                    return overlay
+                    self.lose()
+                    return
         for laser in self.lasers[:]:
             for meteor in self.asteroids[:]:
                 dist = math.hypot(laser["x"] - meteor["x"], laser["y"] - meteor["y"])
@@ -1838,29 +4337,32 @@ class SpaceShooterGame:
                     self.lasers.remove(laser)
                     self.asteroids.remove(meteor)
                     self.score += 1
-                    if self.score >= self.target_score and not self.win:
-                        self.win = True
-                        self.win_fx.start(overlay)
+                    if self.score >= self.target_score:
+                        self.set_win()
                     break
-        self.draw(overlay)
-        return overlay
 
-    def draw(self, overlay, win=False):
+    def bot(self):
+        if not self.asteroids:
+            return None
+        meteor = max(self.asteroids, key=lambda m: m["y"])
+        return (meteor["x"], self.player_y)
+
+    def draw(self, overlay, alpha=1.0, win=False):
         x1, y1, x2, y2 = self.game_area
         region = overlay[y1:y2, x1:x2].copy()
         space_bg = np.full(region.shape, (25, 30, 60), dtype=np.uint8)
         overlay[y1:y2, x1:x2] = cv2.addWeighted(region, 0.65, space_bg, 0.35, 0)
         cv2.rectangle(overlay, (x1, y1), (x2, y2), (255, 255, 255), 2)
-        line_phase = int(time.time() * 80) % max(1, (y2 - y1))
+        line_phase = int(self.render_time() * 80) % max(1, (y2 - y1))
         for offset in range(0, y2 - y1, 50):
             y_line = y1 + (line_phase + offset) % (y2 - y1)
             cv2.line(overlay, (x1, y_line), (x2, y_line), (60, 90, 140), 1)
         for laser in self.lasers:
-            lx, ly = int(laser["x"]), int(laser["y"])
+            lx, ly = int(laser["x"]), int(self.lerp(laser["py"], laser["y"], alpha))
             cv2.line(overlay, (lx, ly), (lx, ly - 18), (0, 255, 200), 3)
             cv2.circle(overlay, (lx, ly - 20), 5, (180, 255, 255), -1)
         for meteor in self.asteroids:
-            mx, my, size = int(meteor["x"]), int(meteor["y"]), meteor["size"]
+            mx, my, size = int(meteor["x"]), int(self.lerp(meteor["py"], meteor["y"], alpha)), meteor["size"]
             cv2.circle(overlay, (mx, my), size, meteor["color"], -1)
             cv2.circle(overlay, (mx, my), size, (255, 255, 255), 2)
         ship_points = np.array([
@@ -1873,53 +4375,44 @@ class SpaceShooterGame:
         thruster_y = int(self.player_y + self.player_height // 2)
         cv2.line(overlay, (int(self.player_x - self.player_width // 4), thruster_y), (int(self.player_x - self.player_width // 4), thruster_y + 16), (0, 160, 255), 4)
         cv2.line(overlay, (int(self.player_x + self.player_width // 4), thruster_y), (int(self.player_x + self.player_width // 4), thruster_y + 16), (0, 160, 255), 4)
-        cv2.putText(overlay, f"Score: {self.score}/{self.target_score}", (x1 + 10, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(overlay, f"Shield: {self.lives}", (x1 + 230, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 210, 180), 2)
-        cv2.putText(overlay, "Gerak pesawat kiri-kanan | Laser otomatis", (x1 + 10, y2 + 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (210, 235, 255), 2)
+        self.put_text(overlay, f"Score: {self.score}/{self.target_score}", (x1 + 10, y1 - 10), 0.7, (255, 255, 255), 2)
+        self.put_text(overlay, f"Shield: {self.lives}", (x1 + 230, y1 - 10), 0.7, (255, 210, 180), 2)
+        self.put_text(overlay, "Gerak pesawat kiri-kanan | Laser otomatis", (x1 + 10, y2 + 25), 0.6, (210, 235, 255), 2)
         if win:
-            cv2.putText(overlay, "WIN! Konfeti 10 detik", (x1 + 120, y1 + 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            self.put_text(overlay, "WIN! Konfeti 10 detik", (x1 + 120, y1 + 200), 0.8, (0, 255, 0), 2)
 
-class FlappyBirdGame:
-    def __init__(self):
-        self.game_area = (100, 100, 700, 500)  
+class FlappyBirdGame(Game):
+    win_label = "FLAPPY WIN!"
+
+    def __init__(self, clock=time.perf_counter, seed=None):
+        super().__init__(clock, seed)
+        self.game_area = (100, 100, 700, 500)
         self.bird_size = 20
         self.pipe_width = 50
         self.gap_size = 180
-        self.pipe_speed = 3
-        self.gravity = 0.5
-        self.lift = -6
-        self.hand_landmarks = None
-        self.mp_hands = None
-        self.max_velocity = 10
-        self.win = False
-        self.win_fx = WinCelebration()
+        self.pipe_speed = 90.0
+        self.gravity = 450.0
+        self.lift = -5400.0
+        self.max_velocity = 300.0
         self.pipe_spacing = 220
+        self.flap = False
         self.reset()
 
     def reset(self):
         self.win = False
         self.win_fx.reset()
+        self.start_round()
         self.bird_x = self.game_area[0] + 100
         self.bird_y = (self.game_area[1] + self.game_area[3]) // 2
+        self.prev_bird_y = self.bird_y
         self.bird_velocity = 0
         self.pipes = []
         self.score = 0
-        self.last_pipe_spawn = time.time()
+        self.last_pipe_spawn = self.sim_time
         self.game_over = False
 
     def update(self, overlay, finger_pos, typed_text=""):
-        if self.win:
-            self.draw(overlay)
-            overlay = self.win_fx.draw(overlay, label="FLAPPY WIN!", subtitle="Konfeti 10 detik sebelum restart")
-            if not self.win_fx.is_active():
-                self.reset()
-            return overlay
-        if self.game_over:
-            if finger_pos:
-                self.reset()
-            self.draw(overlay, win=False)
-            return overlay
-        velocity_change = self.gravity
+        self.flap = False
         if self.hand_landmarks and self.mp_hands:
             thumb_tip = self.hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
             index_tip = self.hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
@@ -1927,24 +4420,30 @@ class FlappyBirdGame:
             thumb_x, thumb_y = thumb_tip.x * w, thumb_tip.y * h
             index_x, index_y = index_tip.x * w, index_tip.y * h
             distance = self.calculate_distance((thumb_x, thumb_y), (index_x, index_y))
-            pinch_threshold = 50
             open_threshold = 120
-            if distance > open_threshold:
-                velocity_change += self.lift
+            self.flap = distance > open_threshold
+        return super().update(overlay, finger_pos, typed_text)
 
-        self.bird_velocity += velocity_change
+    def step(self, dt, finger_pos):
+        if self.game_over:
+            if finger_pos:
+                self.reset()
+            return
+        self.prev_bird_y = self.bird_y
+        acceleration = self.gravity + (self.lift if self.flap else 0.0)
+        self.bird_velocity += acceleration * dt
         self.bird_velocity = max(-self.max_velocity, min(self.max_velocity, self.bird_velocity))
-        self.bird_y += self.bird_velocity
+        self.bird_y += self.bird_velocity * dt
         if self.bird_y < self.game_area[1]:
             self.bird_y = self.game_area[1]
             self.bird_velocity = 0
-            self.game_over = True
+            self.crash()
         if self.bird_y > self.game_area[3] - self.bird_size:
             self.bird_y = self.game_area[3] - self.bird_size
             self.bird_velocity = 0
-            self.game_over = True
+            self.crash()
 
-        if time.time() - self.last_pipe_spawn > 1.6:
+        if self.sim_time - self.last_pipe_spawn > 1.6:
             if not self.pipes or self.pipes[-1]['x'] < self.game_area[2] - self.pipe_spacing:
                 margin = 80
                 min_gap_y = self.game_area[1] + margin + self.gap_size // 2
@@ -1952,61 +4451,158 @@ class FlappyBirdGame:
                 min_gap_y = max(min_gap_y, self.game_area[1] + self.gap_size // 2 + 10)
                 max_gap_y = min(max_gap_y, self.game_area[3] - self.gap_size // 2 - 10)
                 if min_gap_y < max_gap_y:
-                    gap_y = random.randint(min_gap_y, max_gap_y)
+                    gap_y = self.rng.randint(min_gap_y, max_gap_y)
                 else:
                     gap_y = (self.game_area[1] + self.game_area[3]) // 2
                 self.pipes.append({
                     'x': self.game_area[2],
+                    'px': self.game_area[2],
                     'gap_y': gap_y
                 })
-                self.last_pipe_spawn = time.time()
+                self.last_pipe_spawn = self.sim_time
 
         for pipe in self.pipes[:]:
-            pipe['x'] -= self.pipe_speed
+            pipe['px'] = pipe['x']
+            pipe['x'] -= self.pipe_speed * dt
             if pipe['x'] + self.pipe_width < self.game_area[0]:
                 self.pipes.remove(pipe)
                 self.score += 1
                 if self.score >= 10:
-                    self.win = True
-                    self.win_fx.start(overlay)
+                    self.set_win()
             elif (pipe['x'] < self.bird_x + self.bird_size and
                   pipe['x'] + self.pipe_width > self.bird_x and
                   (self.bird_y < pipe['gap_y'] - self.gap_size // 2 or
                    self.bird_y + self.bird_size > pipe['gap_y'] + self.gap_size // 2)):
-                self.game_over = True
+                self.crash()
 
-        self.draw(overlay)
-        return overlay
+    def crash(self):
+        if not self.game_over:
+            self.game_over = True
+            self.end_round("loss")
 
     def calculate_distance(self, point1, point2):
         return ((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)**0.5
 
-    def draw(self, overlay, win=False):
+    def bot(self):
+        ahead = [pipe for pipe in self.pipes if pipe['x'] + self.pipe_width >= self.bird_x]
+        target = ahead[0]['gap_y'] if ahead else (self.game_area[1] + self.game_area[3]) // 2
+        self.flap = self.bird_y + self.bird_size / 2 > target and self.bird_velocity > -60
+        return (int(self.bird_x), int(self.bird_y))
+
+    def draw(self, overlay, alpha=1.0, win=False):
         cv2.rectangle(overlay, (self.game_area[0], self.game_area[1]),
                       (self.game_area[2], self.game_area[3]), (255, 255, 255), 2)
-        cv2.circle(overlay, (int(self.bird_x), int(self.bird_y)), self.bird_size // 2, (255, 255, 0), -1)
+        bird_y = self.lerp(self.prev_bird_y, self.bird_y, alpha) if not self.game_over else self.bird_y
+        cv2.circle(overlay, (int(self.bird_x), int(bird_y)), self.bird_size // 2, (255, 255, 0), -1)
         for pipe in self.pipes:
-            cv2.rectangle(overlay, (int(pipe['x']), self.game_area[1]),
-                          (int(pipe['x']) + self.pipe_width, int(pipe['gap_y'] - self.gap_size // 2)),
+            pipe_x = int(self.lerp(pipe['px'], pipe['x'], alpha))
+            cv2.rectangle(overlay, (pipe_x, self.game_area[1]),
+                          (pipe_x + self.pipe_width, int(pipe['gap_y'] - self.gap_size // 2)),
                           (0, 255, 0), -1)
-            cv2.rectangle(overlay, (int(pipe['x']), int(pipe['gap_y'] + self.gap_size // 2)),
-                          (int(pipe['x']) + self.pipe_width, self.game_area[3]),
+            cv2.rectangle(overlay, (pipe_x, int(pipe['gap_y'] + self.gap_size // 2)),
+                          (pipe_x + self.pipe_width, self.game_area[3]),
                           (0, 255, 0), -1)
-        cv2.putText(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        self.put_text(overlay, f"Score: {self.score}", (self.game_area[0], self.game_area[1] - 10), 0.7, (255, 255, 255), 2)
         if win:
-            cv2.putText(overlay, "WIN!", (self.game_area[0] + 200, self.game_area[1] + 250),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 4)
+            self.put_text(overlay, "WIN!", (self.game_area[0] + 200, self.game_area[1] + 250), 1.5, (0, 255, 0), 4)
         elif self.game_over:
-            cv2.putText(overlay, "Game Over! Point to restart", (self.game_area[0] + 50, self.game_area[3] - 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 0), 2)
+            self.put_text(overlay, "Game Over! Point to restart", (self.game_area[0] + 50, self.game_area[3] - 50), 0.8, (255, 0, 0), 2)
+
+GAME_CLASSES = {
+    "pong": PongGame,
+    "brick": BrickBreakerGame,
+    "catch": CatchGame,
+    "snake": SnakeGame,
+    "mole": WhackAMoleGame,
+    "balloon": BalloonPopGame,
+    "flappy": FlappyBirdGame,
+    "dodge": DodgeGame,
+    "shooter": SpaceShooterGame
+}
+
 
-async def main():
-    keyboard = VirtualKeyboard()
+def build_source(spec):
+    if spec is None or spec.isdigit():
+        return WebcamSource(int(spec or 0), 1920, 1080)
+    if not os.path.exists(spec):
+        raise FileNotFoundError(f"--source {spec!r} is not a camera index or an existing video file or frame directory")
+    if os.path.isdir(spec):
+        source = ImageSequenceSource(spec)
+        if not source.paths:
+            raise ValueError(f"--source {spec!r} contains no {'/'.join(ImageSequenceSource.extensions)} images")
+        return source
+    source = VideoFileSource(spec)
+    if not source.isOpened():
+        raise ValueError(f"--source {spec!r} could not be opened as a video file")
+    return source
+
+
+def photo_quality(value):
+    try:
+        quality = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not an integer")
+    if not 0 <= quality <= 100:
+        raise argparse.ArgumentTypeError(f"{quality} is outside 0-100")
+    return quality
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gesture virtual keyboard")
+    parser.add_argument("--source", help="camera index, video file or directory of frames (default: camera 0)")
+    parser.add_argument("--headless", action="store_true", help="run without a window")
+    parser.add_argument("--output", help="write displayed frames to a video file or frame directory")
+    parser.add_argument("--fps", type=float, default=None, help="target frame rate (default: 60 with a window, unlimited headless)")
+    parser.add_argument("--press", choices=[detector.name.lower().replace(" ", "-") for detector in PRESS_DETECTORS],
+                        help="key press detector (cycle at runtime with 't')")
+    parser.add_argument("--photo-format", choices=["png", "jpg"], default="png", help="photo file format")
+    parser.add_argument("--photo-quality", type=photo_quality, default=None,
+                        help="JPEG quality 0-100 or PNG compression level 0-9")
+    parser.add_argument("--photo-burst", type=int, default=1, help="frames saved around the countdown deadline")
+    parser.add_argument("--meme-cache", help="directory for memory-mapped decoded meme images")
+    parser.add_argument("--record", action="store_true", help="start a session recording immediately (toggle with 'v')")
+    parser.add_argument("--record-raw", action="store_true", help="record the camera frames instead of the composited display")
+    parser.add_argument("--record-landmarks", help="write hand landmarks to a JSON lines session for the typing benchmark")
+    parser.add_argument("--record-target", default="", help="phrase being typed, stored in the recorded session")
+    args = parser.parse_args(argv)
+    if args.photo_format == "png" and args.photo_quality is not None and args.photo_quality > 9:
+        parser.error("--photo-quality is a PNG compression level 0-9 when --photo-format is png")
+    return args
+
+
+async def main(args=None):
+    if args is None:
+        keyboard = VirtualKeyboard()
+    else:
+        if args.output:
+            sink = FileSink(args.output, fps=args.fps or 30)
+        elif args.headless:
+            sink = NullSink()
+        else:
+            sink = None
+        target_fps = args.fps if args.fps is not None else (None if sink is not None else 60)
+        keyboard = VirtualKeyboard(source=build_source(args.source), sink=sink, target_fps=target_fps)
+        if args.press:
+            names = [detector.name.lower().replace(" ", "-") for detector in PRESS_DETECTORS]
+            keyboard.press_mode = names.index(args.press)
+            keyboard.press_detector = keyboard.press_detectors[keyboard.press_mode]
+        keyboard.photo_writer.fmt = args.photo_format
+        if args.photo_quality is not None:
+            if args.photo_format == "jpg":
+                keyboard.photo_writer.jpeg_quality = args.photo_quality
+            else:
+                keyboard.photo_writer.png_compression = args.photo_quality
+        keyboard.photo_burst = max(1, args.photo_burst)
+        keyboard.record_raw = args.record_raw
+        keyboard.meme_assets.cache_dir = args.meme_cache
+        if args.record:
+            keyboard.toggle_recording()
+        if args.record_landmarks:
+            keyboard.landmark_recorder = LandmarkRecorder(args.record_landmarks, target=args.record_target)
     await keyboard.run()
 
 if platform.system() == "Emscripten":
     asyncio.ensure_future(main())
 else:
     if __name__ == "__main__":
-        asyncio.run(main())
+        asyncio.run(main(parse_args()))